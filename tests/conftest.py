@@ -0,0 +1,77 @@
+"""
+Shared pytest configuration for the Unity Terrain Exporter tests.
+
+The heavy GDAL/OSR/QGIS imports happen once here and are handed to the
+test modules through session-scoped fixtures.
+"""
+
+import os
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+# Add the parent directory to the path so we can import the plugin.
+# Done once here so every xdist worker inherits it.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from osgeo import gdal, osr
+import qgis.core
+from unity_terrain_exporter import convert_unity_raw
+
+
+@pytest.fixture(scope="session")
+def gdal_mod():
+    """The osgeo.gdal module."""
+    return gdal
+
+
+@pytest.fixture(scope="session")
+def osr_mod():
+    """The osgeo.osr module."""
+    return osr
+
+
+@pytest.fixture(scope="session")
+def qgis_core():
+    """The qgis.core module."""
+    return qgis.core
+
+
+@pytest.fixture(scope="session")
+def convert_mod():
+    """The plugin's unity_terrain_exporter.convert_unity_raw module."""
+    return convert_unity_raw
+
+
+@pytest.fixture(scope="session")
+def wgs84_wkt():
+    """WKT of WGS84 (EPSG:4326), built once per session (proj.db lookup)."""
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+    return srs.ExportToWkt()
+
+
+@pytest.fixture(scope="session")
+def osr_works():
+    """Skip tests that need real PROJ transformations if OSR is unusable."""
+    try:
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(32610)
+    except Exception as e:
+        pytest.skip(f"OSR/PROJ not usable: {e}")
+    return True
+
+
+@pytest.fixture
+def feedback():
+    """A fresh QgsProcessingFeedback mock (never canceled)."""
+    m = Mock(spec=qgis.core.QgsProcessingFeedback)
+    m.isCanceled.return_value = False
+    return m
+
+
+@pytest.fixture
+def context():
+    """A fresh QgsProcessingContext mock."""
+    return Mock(spec=qgis.core.QgsProcessingContext)
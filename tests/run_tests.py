@@ -5,39 +5,61 @@ Test runner script for Unity Terrain Exporter plugin tests.
 Usage:
     python tests/run_tests.py              # Run all tests
     python tests/run_tests.py -v           # Verbose output
-    python tests/run_tests.py TestUTMDetection  # Run specific test class
+    python tests/run_tests.py -k TestUTMDetection  # Run specific tests
+    python tests/run_tests.py tests/test_utm_detection.py  # Run one file
+
+Test files are distributed across all CPU cores with pytest-xdist
+(one file per worker) when the plugin is installed.
 """
 
 import sys
 import os
-import unittest
+import importlib.util
+
+import pytest
+
+# Test modules are listed explicitly so pytest doesn't have to walk the
+# directory to discover them. Add new test files here.
+TEST_MODULES = (
+    'test_algorithm.py',
+    'test_edge_cases.py',
+    'test_processing.py',
+    'test_utm_detection.py',
+)
 
-# Add the parent directory to the path so we can import the plugin
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+def _has_test_paths(argv):
+    """True if argv names a test file, directory or node id (file.py::test)."""
+    return any(not arg.startswith('-') and os.path.exists(arg.split('::')[0])
+               for arg in argv)
 
-def load_tests():
-    """Load all test cases."""
-    # Discover and load all test modules
-    loader = unittest.TestLoader()
+
+def build_args(argv):
+    """
+    Build the pytest command line (extra arguments are passed through).
+    
+    TEST_MODULES is only added when argv names no test paths, so passing a
+    file or node id narrows the run instead of adding to the full suite.
+    """
     start_dir = os.path.dirname(os.path.abspath(__file__))
-    suite = loader.discover(start_dir, pattern='test_*.py')
-    return suite
+    args = []
+    if not _has_test_paths(argv):
+        args += [os.path.join(start_dir, module) for module in TEST_MODULES]
+
+    # Run test files in parallel if pytest-xdist is available.
+    # --dist=loadfile keeps each file on a single worker, so the heavy
+    # module-level imports (GDAL/OSR/QGIS) are only paid once per file.
+    if importlib.util.find_spec('xdist') is not None:
+        args += ['-n', 'auto', '--dist=loadfile']
+
+    return args + list(argv)
 
 
 def main():
     """Run the test suite."""
-    # Create test suite
-    suite = load_tests()
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
     # Return exit code based on test results
-    sys.exit(0 if result.wasSuccessful() else 1)
+    sys.exit(pytest.main(build_args(sys.argv[1:])))
 
 
 if __name__ == '__main__':
     main()
-
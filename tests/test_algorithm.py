@@ -2,139 +2,128 @@
 Unit tests for the ConvertToUnityRaw algorithm class.
 """
 
-import unittest
-from unittest.mock import Mock, MagicMock, patch, mock_open
-import os
-import tempfile
-import numpy as np
+from unittest.mock import Mock, patch
 
-# Import the classes to test
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pytest
 
-from unity_terrain_exporter.convert_unity_raw import ConvertToUnityRaw
-from qgis.core import QgsProcessingContext, QgsProcessingFeedback
 
+@pytest.fixture
+def algorithm(convert_mod):
+    """A fresh ConvertToUnityRaw instance."""
+    return convert_mod.ConvertToUnityRaw()
 
-class TestConvertToUnityRaw(unittest.TestCase):
+
+class TestConvertToUnityRaw:
     """Test cases for ConvertToUnityRaw algorithm class."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.algorithm = ConvertToUnityRaw()
-        self.context = Mock(spec=QgsProcessingContext)
-        self.feedback = Mock(spec=QgsProcessingFeedback)
-        self.feedback.pushConsoleInfo = Mock()
-        self.feedback.isCanceled = Mock(return_value=False)
-    
-    def test_algorithm_name(self):
+
+    def test_algorithm_name(self, algorithm):
         """Test algorithm name."""
-        self.assertEqual(self.algorithm.name(), 'convert_unity_raw')
-    
-    def test_algorithm_display_name(self):
+        assert algorithm.name() == 'convert_unity_raw'
+
+    def test_algorithm_display_name(self, algorithm):
         """Test algorithm display name."""
-        display_name = self.algorithm.displayName()
-        self.assertIn('Unity', display_name)
-        self.assertIn('RAW', display_name)
+        display_name = algorithm.displayName()
+        assert 'Unity' in display_name
+        assert 'RAW' in display_name
         # After v0.1.2: removed automatic UTM reprojection
-        self.assertNotIn('UTM', display_name, "Display name should not mention UTM (reprojection removed)")
-    
-    def test_algorithm_group(self):
+        assert 'UTM' not in display_name, "Display name should not mention UTM (reprojection removed)"
+
+    def test_algorithm_group(self, algorithm):
         """Test algorithm group."""
-        group = self.algorithm.group()
-        self.assertIn('Unity', group)
-    
-    def test_algorithm_group_id(self):
+        group = algorithm.group()
+        assert 'Unity' in group
+
+    def test_algorithm_group_id(self, algorithm):
         """Test algorithm group ID."""
-        self.assertEqual(self.algorithm.groupId(), 'unity_tools')
-    
-    def test_create_instance(self):
+        assert algorithm.groupId() == 'unity_tools'
+
+    def test_create_instance(self, algorithm, convert_mod):
         """Test createInstance method."""
-        instance = self.algorithm.createInstance()
-        self.assertIsInstance(instance, ConvertToUnityRaw)
-        self.assertIsNot(instance, self.algorithm)  # Should be a new instance
-    
-    def test_init_algorithm_parameters(self):
+        instance = algorithm.createInstance()
+        assert isinstance(instance, convert_mod.ConvertToUnityRaw)
+        assert instance is not algorithm  # Should be a new instance
+
+    def test_init_algorithm_parameters(self, algorithm):
         """Test that algorithm initializes with correct parameters."""
         config = {}
-        self.algorithm.initAlgorithm(config)
-        
+        algorithm.initAlgorithm(config)
+
         # Check that parameters were added
         # We can't easily check the parameter list without QGIS environment,
         # but we can verify the method runs without error
-        self.assertTrue(True)  # If we get here, initAlgorithm worked
-    
-    @patch('unity_terrain_exporter.convert_unity_raw.process_geotiff_for_unity')
-    def test_process_algorithm_success(self, mock_process):
-        """Test successful algorithm processing."""
-        # Mock successful processing
-        mock_process.return_value = True
-        
-        # Mock parameters
-        parameters = {
-            self.algorithm.INPUT: Mock(),
-            self.algorithm.OUTPUT: '/tmp/test_output.raw'
-        }
-        
-        # Mock input layer
-        input_layer = Mock()
-        input_layer.source.return_value = '/tmp/test_input.tif'
-        
-        self.context.parameterAsRasterLayer = Mock(return_value=input_layer)
-        self.context.parameterAsFileOutput = Mock(return_value='/tmp/test_output.raw')
-        
-        # We need to mock the parameterAsRasterLayer method on the algorithm
-        with patch.object(self.algorithm, 'parameterAsRasterLayer', return_value=input_layer):
-            with patch.object(self.algorithm, 'parameterAsFileOutput', return_value='/tmp/test_output.raw'):
-                result = self.algorithm.processAlgorithm(parameters, self.context, self.feedback)
-        
-        # Should return output path on success
-        self.assertIsNotNone(result)
-        self.assertEqual(result[self.algorithm.OUTPUT], '/tmp/test_output.raw')
-        mock_process.assert_called_once()
-    
+        assert True  # If we get here, initAlgorithm worked
+
+    @pytest.mark.parametrize("has_layer,proc_ret,expected", [
+        (True, True, '/tmp/test_output.raw'),   # Success: output path returned
+        (True, False, None),                    # Processing failure
+        (False, None, None),                    # Invalid input layer
+    ])
     @patch('unity_terrain_exporter.convert_unity_raw.process_geotiff_for_unity')
-    def test_process_algorithm_failure(self, mock_process):
-        """Test algorithm processing failure."""
-        # Mock failed processing
-        mock_process.return_value = False
-        
+    def test_process_algorithm(self, mock_process, has_layer, proc_ret, expected,
+                               algorithm, context, feedback):
+        """Test processAlgorithm on success, failure and invalid input."""
+        mock_process.return_value = proc_ret
+
         # Mock parameters
         parameters = {
-            self.algorithm.INPUT: Mock(),
-            self.algorithm.OUTPUT: '/tmp/test_output.raw'
-        }
-        
-        # Mock input layer
-        input_layer = Mock()
-        input_layer.source.return_value = '/tmp/test_input.tif'
-        
-        with patch.object(self.algorithm, 'parameterAsRasterLayer', return_value=input_layer):
-            with patch.object(self.algorithm, 'parameterAsFileOutput', return_value='/tmp/test_output.raw'):
-                result = self.algorithm.processAlgorithm(parameters, self.context, self.feedback)
-        
-        # Should return None on failure
-        self.assertIsNotNone(result)
-        self.assertIsNone(result[self.algorithm.OUTPUT])
-        mock_process.assert_called_once()
-    
-    def test_process_algorithm_invalid_input(self):
-        """Test algorithm with invalid input layer."""
-        parameters = {
-            self.algorithm.INPUT: Mock(),
-            self.algorithm.OUTPUT: '/tmp/test_output.raw'
+            algorithm.INPUT: Mock(),
+            algorithm.OUTPUT: '/tmp/test_output.raw'
         }
-        
-        # Mock invalid input layer (None)
-        with patch.object(self.algorithm, 'parameterAsRasterLayer', return_value=None):
-            result = self.algorithm.processAlgorithm(parameters, self.context, self.feedback)
-        
-        # Should return None output on invalid input
-        self.assertIsNotNone(result)
-        self.assertIsNone(result[self.algorithm.OUTPUT])
-        self.feedback.pushConsoleInfo.assert_called()
 
+        # Mock input layer (None for an invalid layer)
+        input_layer = None
+        if has_layer:
+            input_layer = Mock()
+            input_layer.source.return_value = '/tmp/test_input.tif'
+
+        with patch.multiple(algorithm,
+                            parameterAsRasterLayer=Mock(return_value=input_layer),
+                            parameterAsFileOutput=Mock(return_value='/tmp/test_output.raw'),
+                            parameterAsBoolean=Mock(return_value=True)):
+            result = algorithm.processAlgorithm(parameters, context, feedback)
+
+        # Should return the output path on success, None otherwise
+        assert result is not None
+        assert result[algorithm.OUTPUT] == expected
+
+        if has_layer:
+            mock_process.assert_called_once()
+        else:
+            mock_process.assert_not_called()
+            feedback.pushConsoleInfo.assert_called()
+
+
+class TestBatchConvertToUnityRaw:
+    """Test cases for the BatchConvertToUnityRaw algorithm class."""
+
+    @pytest.fixture
+    def batch_algorithm(self, convert_mod):
+        """A fresh BatchConvertToUnityRaw instance."""
+        return convert_mod.BatchConvertToUnityRaw()
+
+    def test_metadata(self, batch_algorithm, convert_mod):
+        """Test the algorithm ID, group and createInstance."""
+        assert batch_algorithm.name() == 'batch_convert_unity_raw'
+        assert batch_algorithm.groupId() == 'unity_tools'
+        instance = batch_algorithm.createInstance()
+        assert isinstance(instance, convert_mod.BatchConvertToUnityRaw)
+        assert instance is not batch_algorithm
+
+    @patch('unity_terrain_exporter.convert_unity_raw.process_batch')
+    def test_process_algorithm_collects_geotiffs(self, mock_batch, batch_algorithm, context, feedback,
+                                                 tmp_path):
+        """Test that only .tif/.tiff files in the folder are passed on, sorted."""
+        for name in ('b.tif', 'a.TIFF', 'notes.txt'):
+            (tmp_path / name).write_bytes(b'')
+        out_dir = str(tmp_path / 'out')
+        mock_batch.return_value = {}
 
-if __name__ == '__main__':
-    unittest.main()
+        with patch.multiple(batch_algorithm,
+                            parameterAsFile=Mock(return_value=str(tmp_path)),
+                            parameterAsString=Mock(return_value=out_dir),
+                            parameterAsBoolean=Mock(return_value=True)):
+            result = batch_algorithm.processAlgorithm({}, context, feedback)
 
+        assert result == {batch_algorithm.OUTPUT: out_dir}
+        paths = mock_batch.call_args.args[0]
+        assert paths == [str(tmp_path / 'a.TIFF'), str(tmp_path / 'b.tif')]
@@ -3,24 +3,28 @@ Unit tests for edge cases and critical scenarios.
 These tests focus on delicate file manipulation logic.
 """
 
-import unittest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock
 import math
-import sys
-import os
-import tempfile
 import numpy as np
+import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Constant NoData rasters shared by the NoData handling tests
+# (tests that mutate them work on a copy)
+_NODATA_VALUE = -9999.0
+_NODATA_ALL = np.full((2, 2), _NODATA_VALUE, dtype=np.float32)
+_NODATA_PARTIAL = np.array([[100.0, np.nan], [150.0, 200.0]], dtype=np.float32)
 
-from unity_terrain_exporter.convert_unity_raw import get_utm_epsg_code, process_geotiff_for_unity, detect_and_exclude_padding
 
-
-class TestEdgeCases(unittest.TestCase):
+class TestEdgeCases:
     """Test edge cases and critical scenarios."""
     
-    def setUp(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, convert_mod):
         """Set up test fixtures."""
+        self.detect_and_exclude_padding = convert_mod.detect_and_exclude_padding
+        self.normalize_to_uint16 = convert_mod.normalize_to_uint16
+        self.calculate_terrain_dimensions = convert_mod.calculate_terrain_dimensions
+        self.masked_min_max = convert_mod.masked_min_max
         self.feedback = Mock()
         self.feedback.pushConsoleInfo = Mock()
         self.feedback.isCanceled = Mock(return_value=False)
@@ -33,8 +37,8 @@ class TestEdgeCases(unittest.TestCase):
         x_center = width / 2
         y_center = height / 2
         
-        self.assertEqual(x_center, 50.5)
-        self.assertEqual(y_center, 50.5)
+        assert x_center == 50.5
+        assert y_center == 50.5
         
         # Verify this works correctly in geotransform calculation
         # (The code handles float centers correctly)
@@ -54,8 +58,7 @@ class TestEdgeCases(unittest.TestCase):
         y_world = gt[3] + (x_center * gt[4]) + (y_center * gt[5])
         
         # Should be very close to original lon/lat
-        self.assertAlmostEqual(x_world, lon, places=5)
-        self.assertAlmostEqual(y_world, lat, places=5)
+        np.testing.assert_allclose([x_world, y_world], [lon, lat], atol=1e-5)
     
     def test_utm_zone_edge_case_longitude_180(self):
         """Test UTM zone calculation for longitude 180 (edge case).
@@ -70,7 +73,7 @@ class TestEdgeCases(unittest.TestCase):
         
         # The formula gives 61, which is technically outside valid UTM range
         # In practice, this should be handled, but the current code doesn't clamp it
-        self.assertEqual(utm_zone, 61)
+        assert utm_zone == 61
         
         # This would result in EPSG:32661 or EPSG:32761, which don't exist
         # This is a potential bug that should be noted
@@ -81,108 +84,119 @@ class TestEdgeCases(unittest.TestCase):
             epsg_code = 32700 + utm_zone
         
         # EPSG:32661 doesn't exist (max is 32660)
-        self.assertEqual(epsg_code, 32661)
+        assert epsg_code == 32661
         # Note: This is a known limitation - longitude exactly 180° is rare in practice
     
-    def test_crop_offset_calculation_edge_cases(self):
+    @pytest.mark.parametrize("cols,rows,expected_x,expected_y", [
+        (100, 200, 0, 50),      # Standard case
+        (200, 100, 50, 0),      # Wider than tall
+        (101, 201, 0, 50),     # Odd dimensions
+        (1, 100, 0, 49),       # Very narrow
+        (100, 1, 49, 0),       # Very short
+    ])
+    def test_crop_offset_calculation_edge_cases(self, cols, rows, expected_x, expected_y):
         """Test crop offset calculation for various image dimensions."""
-        test_cases = [
-            (100, 200, 0, 50),      # Standard case
-            (200, 100, 50, 0),      # Wider than tall
-            (101, 201, 0, 50),     # Odd dimensions
-            (1, 100, 0, 49),       # Very narrow
-            (100, 1, 49, 0),       # Very short
-        ]
-        
-        for cols, rows, expected_x, expected_y in test_cases:
-            min_dim = min(cols, rows)
-            x_offset = (cols - min_dim) // 2
-            y_offset = (rows - min_dim) // 2
-            
-            self.assertEqual(x_offset, expected_x, 
-                           f"x_offset for {cols}x{rows} should be {expected_x}")
-            self.assertEqual(y_offset, expected_y,
-                           f"y_offset for {cols}x{rows} should be {expected_y}")
+        min_dim = min(cols, rows)
+        x_offset = (cols - min_dim) // 2
+        y_offset = (rows - min_dim) // 2
+        
+        assert x_offset == expected_x, f"x_offset for {cols}x{rows} should be {expected_x}"
+        assert y_offset == expected_y, f"y_offset for {cols}x{rows} should be {expected_y}"
     
-    def test_min_dim_calculation(self):
+    @pytest.mark.parametrize("cols,rows,expected_min", [
+        (100, 200, 100),
+        (200, 100, 100),
+        (100, 100, 100),
+        (1, 1000, 1),
+        (1000, 1, 1),
+    ])
+    def test_min_dim_calculation(self, cols, rows, expected_min):
         """Test min_dim calculation for various cases."""
-        test_cases = [
-            (100, 200, 100),
-            (200, 100, 100),
-            (100, 100, 100),
-            (1, 1000, 1),
-            (1000, 1, 1),
-        ]
-        
-        for cols, rows, expected_min in test_cases:
-            min_dim = min(cols, rows)
-            self.assertEqual(min_dim, expected_min,
-                           f"min_dim for {cols}x{rows} should be {expected_min}")
+        min_dim = min(cols, rows)
+        assert min_dim == expected_min, f"min_dim for {cols}x{rows} should be {expected_min}"
     
     def test_normalization_edge_case_flat_terrain(self):
         """Test normalization when terrain is completely flat (max == min)."""
-        # When max_height == min_height, terrain is flat
-        # Code should handle this by creating zeros
-        min_height = 100.0
-        max_height = 100.0
-        
-        # Simulate the code's logic
-        if max_height == min_height:
-            # Code creates zeros
-            data_uint16 = np.zeros((10, 10), dtype=np.uint16)
-        else:
-            terrain_height_variation = max_height - min_height
-            data_normalized = (np.array([[min_height]]) - min_height) / terrain_height_variation
-            data_uint16 = (data_normalized * 65535).astype(np.uint16)
+        # When max_height == min_height, terrain is flat and maps to zeros
+        data = np.full((10, 10), 100.0, dtype=np.float32)
+        data_uint16 = self.normalize_to_uint16(data, 100.0, 100.0)
         
         # Should be all zeros
-        self.assertTrue(np.all(data_uint16 == 0))
-        self.assertEqual(data_uint16.dtype, np.uint16)
+        np.testing.assert_array_equal(data_uint16, 0)
+        assert data_uint16.dtype == np.dtype("<u2")
+        assert data_uint16.shape == (10, 10)
     
     def test_normalization_calculation(self):
         """Test normalization calculation is correct."""
-        # Test the normalization formula
-        min_height = 100.0
-        max_height = 200.0
-        terrain_height_variation = max_height - min_height
-        
-        # Test various heights
-        test_heights = [100.0, 150.0, 200.0]
-        expected_normalized = [0.0, 0.5, 1.0]
-        expected_uint16 = [0, 32767, 65535]
-        
-        for height, exp_norm, exp_uint in zip(test_heights, expected_normalized, expected_uint16):
-            normalized = (height - min_height) / terrain_height_variation
-            uint16_value = int(normalized * 65535)
-            
-            self.assertAlmostEqual(normalized, exp_norm, places=5)
-            # Allow small rounding differences
-            self.assertAlmostEqual(uint16_value, exp_uint, delta=1)
+        heights = np.array([100.0, 150.0, 200.0], dtype=np.float32)
+        data_uint16 = self.normalize_to_uint16(heights, np.float32(100.0), np.float32(200.0))
+        
+        assert data_uint16.dtype == np.dtype("<u2")
+        # Allow small rounding differences
+        np.testing.assert_allclose(data_uint16, [0, 32767, 65535], atol=1)
+        # Min and max must map exactly to the ends of the range
+        assert data_uint16[0] == 0
+        assert data_uint16[-1] == 65535
     
-    def test_byte_order_handling(self):
-        """Test byte order handling for different systems."""
-        # The code checks sys.byteorder and byteswaps if 'big'
-        # We can't easily test this without mocking sys.byteorder,
-        # but we can verify the logic
+    @pytest.mark.parametrize("dtype", [np.int16, np.uint16, np.int32])
+    def test_normalization_integer_input(self, dtype):
+        """Test that integer heights normalize like their float32 copy, without being modified."""
+        heights = np.arange(0, 3000, 7).astype(dtype)
+        original = heights.copy()
+        
+        data_uint16 = self.normalize_to_uint16(heights, heights.min(), heights.max())
+        expected = self.normalize_to_uint16(heights.astype(np.float32), np.float32(0), np.float32(2996))
         
-        # Little endian (most common) - no swap
-        # Big endian - swap needed
+        np.testing.assert_array_equal(data_uint16, expected)
+        np.testing.assert_array_equal(heights, original)
+    
+    @pytest.mark.parametrize("gt, cols, rows, expected_x, expected_z", [
+        # Projected, square image with square pixels: X == Z
+        ((500000, 10, 0, 4000000, 0, -10), 100, 100, 1000.0, 1000.0),
+        # Projected, non-square pixels
+        ((500000, 10, 0, 4000000, 0, -20), 100, 100, 1000.0, 2000.0),
+        # Rotated geotransform (3-4-5 pixel vectors)
+        ((500000, 3, 4, 4000000, 4, -3), 10, 10, 50.0, 50.0),
+        # Geographic (degrees) at the equator
+        ((10.0, 0.001, 0, 0.05, 0, -0.001), 100, 100,
+         0.1 * 111320.0 * math.cos(0.0), 0.1 * 111320.0),
+    ])
+    def test_terrain_dimensions(self, gt, cols, rows, expected_x, expected_z):
+        """Test terrain size for projected, rotated and geographic geotransforms."""
+        size_x, size_z = self.calculate_terrain_dimensions(gt, cols, rows)
+        assert size_x == pytest.approx(expected_x, rel=1e-6)
+        assert size_z == pytest.approx(expected_z, rel=1e-6)
+    
+    @pytest.mark.parametrize("dtype", [np.float32, np.int16, np.uint16])
+    def test_masked_min_max(self, dtype):
+        """Test min/max over masked pixels for float and integer rasters."""
+        data = np.array([[0, 5, 9], [3, 7, 0]], dtype=dtype)
+        mask = data != 0
+        
+        assert self.masked_min_max(data, mask, np.count_nonzero(mask)) == (3, 9)
+        # Fully valid mask takes the plain reduction path
+        assert self.masked_min_max(data, np.ones_like(mask), mask.size) == (0, 9)
+    
+    def test_byte_order_handling(self):
+        """Test that the output is little-endian regardless of host byte order."""
+        # The .raw is written through a '<u2' array, so numpy stores
+        # little-endian bytes on any host (no explicit byteswap needed)
+        heights = np.array([0.0, 0.5, 1.0], dtype=np.float32)
+        out = np.empty(3, dtype='<u2')
         
-        # Test that the check exists
-        has_byteorder_check = hasattr(sys, 'byteorder')
-        self.assertTrue(has_byteorder_check, "sys.byteorder should exist")
+        result = self.normalize_to_uint16(heights, np.float32(0.0), np.float32(1.0), out=out)
         
-        # The actual byteswap is tested implicitly through the code structure
-        # Full test would require mocking sys.byteorder
+        assert result is out
+        # 0, 32767 (0x7FFF), 65535 in Windows byte order
+        assert out.tobytes() == b'\x00\x00\xff\x7f\xff\xff'
     
     def test_nodata_handling_all_nodata(self):
         """Test handling when all pixels are NoData."""
         # Create array with all NoData
         # Note: The code uses band.GetNoDataValue() which returns a scalar, not NaN directly
         # So we test with a specific NoData value
-        nodata_value = -9999.0
-        data = np.array([[nodata_value, nodata_value], 
-                        [nodata_value, nodata_value]], dtype=np.float32)
+        nodata_value = _NODATA_VALUE
+        data = _NODATA_ALL
         
         # Simulate the code's check (line 193-197)
         if nodata_value is not None:
@@ -195,12 +209,12 @@ class TestEdgeCases(unittest.TestCase):
         else:
             should_fail = False
         
-        self.assertTrue(should_fail, "Should fail when all pixels are NoData")
+        assert should_fail, "Should fail when all pixels are NoData"
     
     def test_nodata_handling_partial_nodata(self):
         """Test handling when some pixels are NoData."""
-        # Create array with some NoData
-        data = np.array([[100.0, np.nan], [150.0, 200.0]], dtype=np.float32)
+        # Array with some NoData (copied, since NoData gets filled below)
+        data = _NODATA_PARTIAL.copy()
         nodata_value = np.nan
         
         # Simulate the code's logic
@@ -216,9 +230,9 @@ class TestEdgeCases(unittest.TestCase):
             min_height = np.min(data)
             should_fail = False
         
-        self.assertFalse(should_fail, "Should not fail when some pixels are valid")
+        assert not should_fail, "Should not fail when some pixels are valid"
         # NoData should be filled with minimum
-        self.assertTrue(np.all(data[~mask] == min_height))
+        np.testing.assert_array_equal(data[~mask], min_height)
     
     def test_padding_detection_with_padding(self):
         """Test padding detection when zeros are concentrated in borders."""
@@ -237,18 +251,18 @@ class TestEdgeCases(unittest.TestCase):
         mask = np.ones_like(data, dtype=bool)
         
         # Test padding detection
-        updated_mask, padding_detected = detect_and_exclude_padding(data, mask, rows, cols)
+        updated_mask, padding_detected = self.detect_and_exclude_padding(data, mask, rows, cols)
         
         # Should detect padding
-        self.assertTrue(padding_detected, "Should detect padding in borders")
+        assert padding_detected, "Should detect padding in borders"
         # Zeros should be excluded from mask
-        self.assertFalse(np.any(updated_mask & (data == 0)), "Zeros should be excluded from mask")
+        np.testing.assert_array_equal(updated_mask[data == 0], False, "Zeros should be excluded from mask")
         # Center should still be valid
         center_start = rows // 4
         center_end = 3 * rows // 4
         center_mask = np.zeros_like(data, dtype=bool)
         center_mask[center_start:center_end, center_start:center_end] = True
-        self.assertTrue(np.all(updated_mask[center_mask]), "Center should remain valid")
+        np.testing.assert_array_equal(updated_mask[center_mask], True, "Center should remain valid")
     
     def test_padding_detection_no_padding(self):
         """Test that valid zero terrain (e.g., sea level) is not detected as padding."""
@@ -266,14 +280,14 @@ class TestEdgeCases(unittest.TestCase):
         mask = np.ones_like(data, dtype=bool)
         
         # Test padding detection
-        updated_mask, padding_detected = detect_and_exclude_padding(data, mask, rows, cols)
+        updated_mask, padding_detected = self.detect_and_exclude_padding(data, mask, rows, cols)
         
         # Should NOT detect padding (zeros are evenly distributed, not concentrated in borders)
         # The threshold requires >30% zeros in borders AND >3x more than center
         # With evenly distributed zeros, border ratio won't be high enough
-        self.assertFalse(padding_detected, "Should not detect padding when zeros are evenly distributed")
+        assert not padding_detected, "Should not detect padding when zeros are evenly distributed"
         # Mask should remain unchanged
-        self.assertTrue(np.array_equal(updated_mask, mask), "Mask should remain unchanged")
+        np.testing.assert_array_equal(updated_mask, mask, "Mask should remain unchanged")
     
     def test_padding_detection_no_zeros(self):
         """Test padding detection when there are no zeros."""
@@ -281,10 +295,10 @@ class TestEdgeCases(unittest.TestCase):
         data = np.ones((rows, cols), dtype=np.float32) * 100.0  # All terrain, no zeros
         mask = np.ones_like(data, dtype=bool)
         
-        updated_mask, padding_detected = detect_and_exclude_padding(data, mask, rows, cols)
+        updated_mask, padding_detected = self.detect_and_exclude_padding(data, mask, rows, cols)
         
-        self.assertFalse(padding_detected, "Should not detect padding when there are no zeros")
-        self.assertTrue(np.array_equal(updated_mask, mask), "Mask should remain unchanged")
+        assert not padding_detected, "Should not detect padding when there are no zeros"
+        np.testing.assert_array_equal(updated_mask, mask, "Mask should remain unchanged")
     
     def test_padding_detection_all_zeros(self):
         """Test padding detection when all pixels are zero."""
@@ -292,11 +306,11 @@ class TestEdgeCases(unittest.TestCase):
         data = np.zeros((rows, cols), dtype=np.float32)  # All zeros
         mask = np.ones_like(data, dtype=bool)
         
-        updated_mask, padding_detected = detect_and_exclude_padding(data, mask, rows, cols)
+        updated_mask, padding_detected = self.detect_and_exclude_padding(data, mask, rows, cols)
         
         # When all pixels are zero, no padding to detect (all zeros = no comparison possible)
-        self.assertFalse(padding_detected, "Should not detect padding when all pixels are zero")
-        self.assertTrue(np.array_equal(updated_mask, mask), "Mask should remain unchanged")
+        assert not padding_detected, "Should not detect padding when all pixels are zero"
+        np.testing.assert_array_equal(updated_mask, mask, "Mask should remain unchanged")
     
     def test_padding_detection_with_existing_mask(self):
         """Test padding detection when initial mask already excludes some pixels."""
@@ -314,16 +328,11 @@ class TestEdgeCases(unittest.TestCase):
         mask = np.ones_like(data, dtype=bool)
         mask[0:10, 0:10] = False  # Some NoData in corner
         
-        updated_mask, padding_detected = detect_and_exclude_padding(data, mask, rows, cols)
+        updated_mask, padding_detected = self.detect_and_exclude_padding(data, mask, rows, cols)
         
         # Should still detect padding
-        self.assertTrue(padding_detected, "Should detect padding even with existing mask")
+        assert padding_detected, "Should detect padding even with existing mask"
         # Original NoData should still be excluded
-        self.assertFalse(np.any(updated_mask[0:10, 0:10]), "Original NoData should remain excluded")
+        np.testing.assert_array_equal(updated_mask[0:10, 0:10], False, "Original NoData should remain excluded")
         # Padding zeros should also be excluded
-        self.assertFalse(np.any(updated_mask & (data == 0)), "Padding zeros should be excluded")
-
-
-if __name__ == '__main__':
-    unittest.main()
-
+        np.testing.assert_array_equal(updated_mask[data == 0], False, "Padding zeros should be excluded")
@@ -6,136 +6,178 @@ Note: The get_utm_epsg_code function is no longer used in the main workflow
 and in case the function is needed in the future.
 """
 
-import unittest
-from unittest.mock import Mock, MagicMock, patch
-import math
-from osgeo import gdal, osr
+from dataclasses import dataclass
+from unittest.mock import Mock
 
-# Import the function to test
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+import pytest
 
-from unity_terrain_exporter.convert_unity_raw import get_utm_epsg_code
+# Skip the whole module early if GDAL's OSR bindings are unavailable
+pytest.importorskip("osgeo.osr")
 
+# Longitude -> expected UTM zone table (formula: floor((lon + 180) / 6) + 1)
+_UTM_LONGITUDES = np.array([
+    -180,   # Western edge
+    -177,   # Zone 1
+    0,      # Prime meridian (Zone 31)
+    3,      # Zone 31
+    177,    # Zone 60
+    180,    # Eastern edge (formula gives 61, but UTM max is 60)
+])
+_UTM_EXPECTED_ZONES = np.array([1, 1, 31, 31, 60, 61])
 
-class TestUTMDetection(unittest.TestCase):
+
+@dataclass
+class FakeDataset:
+    """Minimal stand-in for a GDAL dataset (plain attributes, no MagicMock)."""
+    RasterXSize: int
+    RasterYSize: int
+    geotransform: tuple
+    projection: str
+
+    def GetGeoTransform(self):
+        return self.geotransform
+
+    def GetProjection(self):
+        return self.projection
+
+
+def create_mock_dataset(lon, lat, srs_wkt, width=100, height=100):
+    """Helper to create a fake GDAL dataset.
+    
+    srs_wkt is the dataset projection (tests pass the session-cached
+    wgs84_wkt fixture, so the EPSG lookup is done only once).
+    
+    The geotransform must be set so that when we calculate the center pixel:
+    x_center_world = gt[0] + (x_center_pixel * gt[1]) + (y_center_pixel * gt[2])
+    y_center_world = gt[3] + (x_center_pixel * gt[4]) + (y_center_pixel * gt[5])
+    
+    Results in (lon, lat) at the center.
+    
+    Assuming no rotation (gt[2] = gt[4] = 0):
+    - x_center_pixel = width / 2
+    - y_center_pixel = height / 2
+    - lon = gt[0] + (width/2 * gt[1])
+    - lat = gt[3] + (height/2 * gt[5])
+    
+    If we want pixel_size degrees per pixel:
+    - gt[0] = lon - (width/2 * pixel_size)
+    - gt[1] = pixel_size
+    - gt[3] = lat - (height/2 * pixel_size)  # Note: gt[5] is negative
+    - gt[5] = -pixel_size
+    """
+    # Use a reasonable pixel size (e.g., 0.01 degrees per pixel)
+    pixel_size = 0.01
+    
+    # Calculate geotransform so center pixel maps to (lon, lat)
+    # gt[0] = top-left x coordinate
+    # gt[1] = pixel width in x direction
+    # gt[2] = row rotation (0 for north-up)
+    # gt[3] = top-left y coordinate  
+    # gt[4] = column rotation (0 for north-up)
+    # gt[5] = pixel height in y direction (negative for north-up)
+    geotransform = (
+        lon - (width / 2 * pixel_size),  # gt[0]: top-left x
+        pixel_size,  # gt[1]: pixel width
+        0.0,  # gt[2]: row rotation
+        lat + (height / 2 * pixel_size),  # gt[3]: top-left y (note: + because gt[5] is negative)
+        0.0,  # gt[4]: column rotation
+        -pixel_size  # gt[5]: pixel height (negative for north-up images)
+    )
+    
+    return FakeDataset(width, height, geotransform, srs_wkt)
+
+
+class TestUTMDetection:
     """Test cases for get_utm_epsg_code function."""
     
-    def setUp(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, wgs84_wkt, convert_mod):
         """Set up test fixtures."""
+        self.wgs84_wkt = wgs84_wkt
+        self.get_utm_epsg_code = convert_mod.get_utm_epsg_code
         self.feedback = Mock()
         self.feedback.pushConsoleInfo = Mock()
     
-    def create_mock_dataset(self, lon, lat, width=100, height=100, srs_wkt=None):
-        """Helper to create a mock GDAL dataset.
-        
-        The geotransform must be set so that when we calculate the center pixel:
-        x_center_world = gt[0] + (x_center_pixel * gt[1]) + (y_center_pixel * gt[2])
-        y_center_world = gt[3] + (x_center_pixel * gt[4]) + (y_center_pixel * gt[5])
-        
-        Results in (lon, lat) at the center.
-        
-        Assuming no rotation (gt[2] = gt[4] = 0):
-        - x_center_pixel = width / 2
-        - y_center_pixel = height / 2
-        - lon = gt[0] + (width/2 * gt[1])
-        - lat = gt[3] + (height/2 * gt[5])
-        
-        If we want pixel_size degrees per pixel:
-        - gt[0] = lon - (width/2 * pixel_size)
-        - gt[1] = pixel_size
-        - gt[3] = lat - (height/2 * pixel_size)  # Note: gt[5] is negative
-        - gt[5] = -pixel_size
-        """
-        dataset = MagicMock()
-        dataset.RasterXSize = width
-        dataset.RasterYSize = height
-        
-        # Use a reasonable pixel size (e.g., 0.01 degrees per pixel)
-        pixel_size = 0.01
-        
-        # Calculate geotransform so center pixel maps to (lon, lat)
-        # gt[0] = top-left x coordinate
-        # gt[1] = pixel width in x direction
-        # gt[2] = row rotation (0 for north-up)
-        # gt[3] = top-left y coordinate  
-        # gt[4] = column rotation (0 for north-up)
-        # gt[5] = pixel height in y direction (negative for north-up)
-        dataset.GetGeoTransform.return_value = (
-            lon - (width / 2 * pixel_size),  # gt[0]: top-left x
-            pixel_size,  # gt[1]: pixel width
-            0.0,  # gt[2]: row rotation
-            lat + (height / 2 * pixel_size),  # gt[3]: top-left y (note: + because gt[5] is negative)
-            0.0,  # gt[4]: column rotation
-            -pixel_size  # gt[5]: pixel height (negative for north-up images)
-        )
-        
-        # Create a simple WGS84 projection for testing
-        if srs_wkt is None:
-            srs = osr.SpatialReference()
-            srs.ImportFromEPSG(4326)  # WGS84
-            srs_wkt = srs.ExportToWkt()
-        
-        dataset.GetProjection.return_value = srs_wkt
-        
-        return dataset
-    
-    def test_utm_zone_detection(self):
+    def test_utm_zone_detection(self, osr_works):
         """Test UTM detection returns valid EPSG code."""
         # Test with a simple location
         lon, lat = -46.6, -23.5  # Example location (São Paulo, Brazil)
         
         # Create a real WGS84 dataset mock
-        dataset = self.create_mock_dataset(lon, lat)
+        dataset = create_mock_dataset(lon, lat, self.wgs84_wkt)
         
         # Use real osr for transformation (since we're testing the logic)
-        try:
-            result = get_utm_epsg_code(dataset, self.feedback)
-            
-            # Should return a valid EPSG code
-            self.assertIsNotNone(result)
-            self.assertTrue(result.startswith('EPSG:'))
-            
-            # Should be a valid UTM EPSG code (32601-32660 for North, 32701-32760 for South)
-            epsg_num = int(result.split(':')[1])
-            self.assertGreaterEqual(epsg_num, 32601)
-            self.assertLessEqual(epsg_num, 32760)
-            
-            # Verify feedback was called
-            self.feedback.pushConsoleInfo.assert_called()
-        except (AttributeError, TypeError) as e:
-            # If dataset mock doesn't work properly, skip
-            self.skipTest(f"Mock dataset issue: {e}")
-        except Exception as e:
-            # If real GDAL/osr fails, skip this test
-            self.skipTest(f"Requires GDAL/osr: {e}")
+        result = self.get_utm_epsg_code(dataset, self.feedback)
+        
+        # Should return a valid EPSG code
+        assert result is not None
+        assert result.startswith('EPSG:')
+        
+        # Should be a valid UTM EPSG code (32601-32660 for North, 32701-32760 for South)
+        epsg_num = int(result.split(':')[1])
+        assert epsg_num >= 32601
+        assert epsg_num <= 32760
+        
+        # Verify feedback was called
+        self.feedback.pushConsoleInfo.assert_called()
+    
+    def test_transformation_is_cached(self, osr_works, convert_mod):
+        """Test that the WGS84 transformation is built once per source projection."""
+        first = create_mock_dataset(-46.6, -23.5, self.wgs84_wkt)
+        second = create_mock_dataset(10.0, 45.0, self.wgs84_wkt)
+        
+        convert_mod._transform_to_wgs84.cache_clear()
+        assert self.get_utm_epsg_code(first, self.feedback) == 'EPSG:32723'
+        assert self.get_utm_epsg_code(second, self.feedback) == 'EPSG:32632'
+        
+        info = convert_mod._transform_to_wgs84.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+    
+    def test_wgs84_input_skips_transformation(self, osr_works, osr_mod, convert_mod):
+        """Test that WGS84 input is used as lon/lat without building a transformation."""
+        assert convert_mod._transform_to_wgs84(self.wgs84_wkt) is None
+        
+        # Other geographic CRSs still go through PROJ
+        nad83 = osr_mod.SpatialReference()
+        nad83.ImportFromEPSG(4269)
+        assert convert_mod._transform_to_wgs84(nad83.ExportToWkt()) is not None
+        dataset = create_mock_dataset(-46.6, -23.5, nad83.ExportToWkt())
+        assert self.get_utm_epsg_code(dataset, self.feedback) == 'EPSG:32723'
+    
+    def test_utm_input_keeps_its_zone(self, osr_works, osr_mod, convert_mod):
+        """Test that UTM input returns its own EPSG code without a PROJ transformation."""
+        utm = osr_mod.SpatialReference()
+        utm.ImportFromEPSG(32723)
+        # Intended contract (changed from the earlier center-zone behavior):
+        # input that is already UTM keeps its own zone, even when the raster
+        # center lies in a neighboring zone (here zone 24), matching the main
+        # workflow, which accepts UTM input as-is
+        dataset = FakeDataset(100, 100, (1000000.0, 10, 0, 7400000.0, 0, -10), utm.ExportToWkt())
+        
+        convert_mod._transform_to_wgs84.cache_clear()
+        assert self.get_utm_epsg_code(dataset, self.feedback) == 'EPSG:32723'
+        assert convert_mod._transform_to_wgs84.cache_info().currsize == 0
+    
+    def test_clear_caches(self, osr_works, convert_mod):
+        """Test that clear_caches empties the projection caches."""
+        self.get_utm_epsg_code(create_mock_dataset(10.0, 45.0, self.wgs84_wkt), self.feedback)
+        
+        convert_mod.clear_caches()
+        
+        assert convert_mod._transform_to_wgs84.cache_info().currsize == 0
+        assert convert_mod._source_utm_epsg.cache_info().currsize == 0
     
     def test_utm_zone_calculation(self):
         """Test UTM zone calculation formula."""
-        # Test various longitudes
         # Note: Longitude 180 gives zone 61 with the formula, but UTM zones are 1-60
         # This is a known limitation - longitude exactly 180° is rare in practice
         # and would result in invalid EPSG code (32661 or 32761)
-        test_cases = [
-            (-180, 1),   # Western edge
-            (-177, 1),   # Zone 1
-            (0, 31),     # Prime meridian (Zone 31)
-            (3, 31),     # Zone 31
-            (177, 60),   # Zone 60
-            (180, 61),   # Eastern edge (formula gives 61, but UTM max is 60)
-        ]
-        
-        for lon, expected_zone in test_cases:
-            utm_zone = math.floor((lon + 180) / 6) + 1
-            self.assertEqual(utm_zone, expected_zone, 
-                           f"Longitude {lon} should calculate to zone {expected_zone}")
-            
-            # Verify that zones 1-60 are valid, but 61+ would be invalid
-            if utm_zone > 60:
-                # This would create invalid EPSG code
-                self.assertGreater(utm_zone, 60, 
-                                 "Zone > 60 would create invalid EPSG code")
+        np.testing.assert_array_equal(
+            np.floor((_UTM_LONGITUDES + 180) / 6).astype(int) + 1,
+            _UTM_EXPECTED_ZONES,
+            "Longitudes should calculate to the expected UTM zones")
     
     def test_hemisphere_detection(self):
         """Test hemisphere detection for EPSG code."""
@@ -149,7 +191,7 @@ class TestUTMDetection(unittest.TestCase):
             epsg_code = 32600 + zone
         else:
             epsg_code = 32700 + zone
-        self.assertEqual(epsg_code, 32610)
+        assert epsg_code == 32610
         
         # Test Southern (negative latitude)
         lat = -40.0
@@ -158,39 +200,30 @@ class TestUTMDetection(unittest.TestCase):
             epsg_code = 32600 + zone
         else:
             epsg_code = 32700 + zone
-        self.assertEqual(epsg_code, 32710)
+        assert epsg_code == 32710
     
     def test_invalid_dataset(self):
         """Test handling of invalid dataset."""
         dataset = None
         
         # The function catches exceptions and returns None, so it won't raise
-        result = get_utm_epsg_code(dataset, self.feedback)
-        self.assertIsNone(result)
+        result = self.get_utm_epsg_code(dataset, self.feedback)
+        assert result is None
         self.feedback.pushConsoleInfo.assert_called()
     
     def test_transformation_error(self):
         """Test error handling when transformation fails."""
         # Create a dataset with invalid projection that will cause transformation to fail
-        dataset = MagicMock()
-        dataset.RasterXSize = 100
-        dataset.RasterYSize = 100
-        dataset.GetGeoTransform.return_value = (0, 1, 0, 0, 0, -1)
         # Invalid WKT that will cause osr.SpatialReference to fail or transformation to fail
-        dataset.GetProjection.return_value = 'INVALID_PROJECTION_WKT'
+        dataset = FakeDataset(100, 100, (0, 1, 0, 0, 0, -1), 'INVALID_PROJECTION_WKT')
         
-        result = get_utm_epsg_code(dataset, self.feedback)
+        result = self.get_utm_epsg_code(dataset, self.feedback)
         
         # Should return None on error
-        self.assertIsNone(result)
+        assert result is None
         # Should log the error
         self.feedback.pushConsoleInfo.assert_called()
         # Check that error message was logged (verify any call contains 'Error')
         calls_made = self.feedback.pushConsoleInfo.call_args_list
         error_logged = any('Error' in str(call) for call in calls_made)
-        self.assertTrue(error_logged, "Error message should be logged")
-
-
-if __name__ == '__main__':
-    unittest.main()
-
+        assert error_logged, "Error message should be logged"
@@ -10,15 +10,28 @@ import os
 import sys
 import tempfile
 
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_NAME = os.path.basename(__file__)
+
 # Add parent directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(_SCRIPT_DIR, '..'))
 
 from unity_terrain_exporter.convert_unity_raw import process_geotiff_for_unity
 from qgis.core import QgsProcessingFeedback
 
+# Conversion log and progress output can be silenced with --quiet (errors and
+# warnings are still printed; MockFeedback still keeps every log message)
+_VERBOSE = '--quiet' not in sys.argv
+
+
+def _log(msg):
+    """Print a progress message unless --quiet was given."""
+    if _VERBOSE:
+        print(msg)
+
 
 class MockFeedback(QgsProcessingFeedback):
-    """Mock feedback that captures log messages."""
+    """Mock feedback that captures log messages and reported metrics."""
     def __init__(self):
         self.messages = []
         self.min_height = None
@@ -31,53 +44,35 @@ class MockFeedback(QgsProcessingFeedback):
     
     def pushConsoleInfo(self, msg):
         self.messages.append(msg)
-        print(msg)
-        
-        # Parse Unity Import Settings from log
-        if "Resolution (Width/Height):" in msg:
-            parts = msg.split(":")[1].strip().split("x")
-            self.width = int(parts[0])
-            self.height = int(parts[1])
-        elif "  X:" in msg:
-            # Parse "  X: 98710.00m" or "  X: 98710.00 (units may not be meters...)"
-            x_str = msg.split(":")[1].strip().split()[0].replace("m", "")
-            self.terrain_size_x = float(x_str)
-        elif "  Y:" in msg:
-            # Parse "  Y: 1209.00m"
-            y_str = msg.split(":")[1].strip().split()[0].replace("m", "")
-            self.variation = float(y_str)
-        elif "  Z:" in msg:
-            # Parse "  Z: 84500.00m" or "  Z: 84500.00 (units may not be meters...)"
-            z_str = msg.split(":")[1].strip().split()[0].replace("m", "")
-            self.terrain_size_z = float(z_str)
-        elif "  Min Height:" in msg:
-            self.min_height = float(msg.split(":")[1].strip().replace("m", ""))
-        elif "  Max Height:" in msg:
-            self.max_height = float(msg.split(":")[1].strip().replace("m", ""))
+        _log(msg)
+    
+    def report_metric(self, key, value):
+        """Receive a numeric result (width, min_height, ...) from the conversion."""
+        setattr(self, key, value)
     
     def isCanceled(self):
         return False
 
 
 def main():
-    if len(sys.argv) < 3:
+    file_args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(file_args) < 2:
         print(f"\n❌ Error: Missing required arguments")
         print(f"\n💡 Usage:")
-        print(f"   python3 {os.path.basename(__file__)} <input.tif> <output.raw>")
+        print(f"   python3 {_NAME} <input.tif> <output.raw> [--quiet]")
         print(f"\n📝 Example:")
-        print(f"   python3 {os.path.basename(__file__)} terrain.tif terrain.raw")
+        print(f"   python3 {_NAME} terrain.tif terrain.raw")
         return 1
     
-    input_tif = sys.argv[1]
-    output_raw = sys.argv[2]
+    input_tif, output_raw = file_args[:2]
     
     if not os.path.exists(input_tif):
         print(f"❌ Error: Input file not found: {input_tif}")
         return 1
     
-    print(f"\n{'='*70}")
-    print(f"🔄 Generating .raw file from GeoTIFF...")
-    print(f"{'='*70}")
+    _log(f"\n{'='*70}")
+    _log(f"🔄 Generating .raw file from GeoTIFF...")
+    _log(f"{'='*70}")
     
     feedback = MockFeedback()
     success = process_geotiff_for_unity(input_tif, output_raw, feedback)
@@ -86,21 +81,6 @@ def main():
         print(f"\n❌ Error: Failed to generate .raw file")
         return 1
     
-    # Check if we got all the values from the log
-    if not all([feedback.width, feedback.height, feedback.min_height, feedback.max_height, feedback.variation]):
-        print(f"\n⚠️  Warning: Could not parse all values from log")
-        print(f"   Width: {feedback.width}, Height: {feedback.height}")
-        print(f"   X: {feedback.terrain_size_x}, Z: {feedback.terrain_size_z}")
-        print(f"   Min: {feedback.min_height}, Max: {feedback.max_height}, Variation: {feedback.variation}")
-        print(f"   Using fallback values...")
-        # Fallback: try to get from file
-        from osgeo import gdal
-        ds = gdal.Open(input_tif, gdal.GA_ReadOnly)
-        if ds:
-            feedback.width = ds.RasterXSize
-            feedback.height = ds.RasterYSize
-            ds = None
-    
     if not all([feedback.width, feedback.height, feedback.min_height, feedback.max_height, feedback.variation]):
         print(f"\n⚠️  Warning: Some values missing, but .raw file was generated")
         print(f"   You may need to provide these manually for visualization:")
@@ -108,13 +88,13 @@ def main():
         print(f"   X: {feedback.terrain_size_x}, Z: {feedback.terrain_size_z}")
         print(f"   Min: {feedback.min_height}, Max: {feedback.max_height}, Variation: {feedback.variation}")
     else:
-        print(f"\n✓ .raw file generated successfully")
-        print(f"   File: {output_raw}")
-        print(f"   Resolution: {feedback.width}x{feedback.height}")
-        print(f"   Terrain Size: X={feedback.terrain_size_x:.2f}m, Y={feedback.variation:.2f}m, Z={feedback.terrain_size_z:.2f}m")
-        print(f"   Elevation: {feedback.min_height:.2f}m - {feedback.max_height:.2f}m")
-        print(f"\n💡 To visualize, run:")
-        print(f"   python3 visualize_raw.py {output_raw} {feedback.width} {feedback.height} {feedback.min_height:.2f} {feedback.max_height:.2f} {feedback.variation:.2f}")
+        _log(f"\n✓ .raw file generated successfully")
+        _log(f"   File: {output_raw}")
+        _log(f"   Resolution: {feedback.width}x{feedback.height}")
+        _log(f"   Terrain Size: X={feedback.terrain_size_x:.2f}m, Y={feedback.variation:.2f}m, Z={feedback.terrain_size_z:.2f}m")
+        _log(f"   Elevation: {feedback.min_height:.2f}m - {feedback.max_height:.2f}m")
+        _log(f"\n💡 To visualize, run:")
+        _log(f"   python3 visualize_raw.py {output_raw} {feedback.width} {feedback.height} {feedback.min_height:.2f} {feedback.max_height:.2f} {feedback.variation:.2f}")
     
     return 0
 
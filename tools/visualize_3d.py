@@ -8,18 +8,23 @@ This script opens only the 3D interactive view for exploring the terrain.
 import os
 import sys
 
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_NAME = os.path.basename(__file__)
+
 # Import from visualize_raw module
-sys.path.insert(0, os.path.dirname(__file__))
-from visualize_raw import read_raw_file, visualize_raw
+sys.path.insert(0, _SCRIPT_DIR)
+from visualize_raw import read_raw_file, visualize_raw, parse_grid
 
 
 def main():
     if len(sys.argv) < 6:
         print(f"\n❌ Error: Missing required arguments")
         print(f"\n💡 Usage:")
-        print(f"   python3 {os.path.basename(__file__)} <raw_file> <width> <height> <min_elevation> <max_elevation> <variation>")
+        print(f"   python3 {_NAME} <raw_file> <width> <height> <min_elevation> <max_elevation> <variation> [options]")
         print(f"\n📝 Example:")
-        print(f"   python3 {os.path.basename(__file__)} output.raw 2049 2049 881.0 2090.0 1209.0")
+        print(f"   python3 {_NAME} output.raw 2049 2049 881.0 2090.0 1209.0")
+        print(f"\n💡 Options:")
+        print(f"   --quiet          Don't print progress messages")
         return 1
     
     raw_path = sys.argv[1]
@@ -28,6 +33,9 @@ def main():
     min_elevation = float(sys.argv[4])
     max_elevation = float(sys.argv[5])
     variation = float(sys.argv[6])
+    grid = parse_grid(sys.argv)
+    if grid is None:
+        return 1
     
     if not os.path.exists(raw_path):
         print(f"❌ Error: File not found: {raw_path}")
@@ -36,7 +44,7 @@ def main():
     try:
         # Show only 3D interactive view
         visualize_raw(raw_path, width, height, min_elevation, max_elevation, variation,
-                      save_images=False, show_interactive=True, show_3d_only=True)
+                      save_images=False, show_3d=True, grid=grid)
         return 0
     except Exception as e:
         print(f"\n❌ Error: {e}")
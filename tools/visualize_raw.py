@@ -8,23 +8,194 @@ similar to how Unity would render it.
 
 import os
 import sys
+from functools import lru_cache
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import matplotlib
+# Image-only runs never open a window: pick the Agg backend before pyplot is
+# imported so no GUI toolkit (Qt/Tk) gets initialized. Also applies when
+# pipeline.py imports this module with --images-only on its command line.
+if '--images-only' in sys.argv:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.colors import Normalize
+from PIL import Image
 from mpl_toolkits.mplot3d import Axes3D
 
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_EXAMPLE_PATH = os.path.join(_SCRIPT_DIR, '..', 'samples', 'example.tif')
+
+# Progress output can be silenced with --quiet (errors are still printed)
+_VERBOSE = '--quiet' not in sys.argv
+
+# Resolution of the saved images (override with the TERRAIN_DPI env var,
+# e.g. TERRAIN_DPI=300 for publication-quality output)
+DPI = int(os.environ.get('TERRAIN_DPI', 150))
+
+# Default target 3D surface grid size per side (--grid=N). mplot3d sorts
+# every polygon on each draw, so smaller grids render much faster but coarser.
+DEFAULT_GRID = 200
+
+def _log(msg):
+    """Print a progress message unless --quiet was given."""
+    if _VERBOSE:
+        print(msg)
+
+
+def parse_grid(argv):
+    """
+    Returns the --grid=N value from argv (DEFAULT_GRID if not given), or None
+    after printing an error if N is not a positive integer.
+    """
+    values = [arg.split('=', 1)[1] for arg in argv if arg.startswith('--grid=')]
+    if not values:
+        return DEFAULT_GRID
+    try:
+        grid = int(values[-1])
+    except ValueError:
+        grid = 0
+    if grid < 1:
+        print(f"❌ Error: --grid must be a positive integer (got '{values[-1]}')")
+        print("\n💡 Usage:")
+        print(f"   --grid=N         Target 3D grid size per side (default {DEFAULT_GRID}; lower is faster, coarser)")
+        return None
+    return grid
+
+
 def read_raw_file(filepath, width, height):
-    """Read a Unity .raw file (16-bit unsigned integer, Little Endian)."""
-    with open(filepath, 'rb') as f:
-        data = np.frombuffer(f.read(), dtype=np.uint16)
+    """Read a Unity .raw file (16-bit unsigned integer, Little Endian).
+    
+    The file is memory-mapped (read-only), so pages are loaded on demand
+    instead of copying the whole file into a Python bytes object first.
+    """
+    file_size = os.path.getsize(filepath)
+    if file_size != width * height * 2:
+        raise ValueError(f"File size mismatch: expected {width * height} pixels "
+                         f"({width * height * 2} bytes), got {file_size} bytes")
+    
+    return np.memmap(filepath, dtype=np.dtype('<u2'), mode='r', shape=(height, width))
+
+
+def to_elevation(raw, min_elevation, variation):
+    """
+    Convert raw Unity heights to real-world elevation (meters).
+    
+    elevation = min + (raw / 65535) * variation, computed in place on a single
+    float32 buffer (no intermediate normalized array).
+    """
+    elevation = raw.astype(np.float32)
+    elevation *= np.float32(variation / 65535.0)
+    elevation += np.float32(min_elevation)
+    return elevation
+
+
+def block_mean(array, block):
+    """
+    Downsample a 2D array by averaging non-overlapping block x block tiles.
+    
+    Trailing rows/columns that don't fill a whole block are dropped.
+    Averaging (instead of picking every Nth pixel) avoids aliasing, and the
+    reshape-based reduction streams through the array sequentially.
+    """
+    if block == 1:
+        return array
+    rows = (array.shape[0] // block) * block
+    cols = (array.shape[1] // block) * block
+    tiles = array[:rows, :cols].reshape(rows // block, block, cols // block, block)
+    return tiles.mean(axis=(1, 3))
+
+
+def elevation_norm(min_elevation, max_elevation):
+    """
+    Color scale for the terrain colormap, fixed to the known elevation range.
     
-    if len(data) != width * height:
-        raise ValueError(f"File size mismatch: expected {width * height} pixels, got {len(data)}")
+    Shared by the heightmap image and the 3D surfaces so they use identical
+    colors, and spares imshow an autoscaling min/max pass over the full array.
+    """
+    return Normalize(vmin=min_elevation, vmax=max_elevation)
+
+
+def plot_terrain_surface(ax, X, Y, elevation_downsampled, norm):
+    """Draw the terrain surface on a 3D axis (shared by saved and interactive views)."""
+    return ax.plot_surface(X, Y, elevation_downsampled, cmap='terrain', norm=norm,
+                           linewidth=0, antialiased=True, alpha=0.9,
+                           rasterized=True)
+
+
+def _init_render_worker():
+    """Use the non-interactive Agg backend in image worker processes."""
+    plt.switch_backend('Agg')
+
+
+def _elevation_title(meta):
+    min_elevation, max_elevation, variation = meta
+    return f'Elevation: {min_elevation:.0f}m - {max_elevation:.0f}m (Range: {variation:.0f}m)'
+
+
+def _render_heightmap_gray(heightmap8, output):
+    """
+    Save the grayscale heightmap (how Unity sees it) as a plain 8-bit PNG.
     
-    return data.reshape((height, width))
+    Written straight from the array with Pillow (a matplotlib dependency):
+    one pixel per sample, no figure layout, axes or colorbar to render.
+    """
+    Image.fromarray(heightmap8).save(output, optimize=True)
+    return output
+
+
+def _render_heightmap_terrain(elevation, meta, output):
+    """Save the heightmap with the terrain colormap."""
+    fig, ax = plt.subplots(figsize=(12, 12), layout='constrained')
+    im = ax.imshow(elevation, cmap='terrain', norm=elevation_norm(*meta[:2]),
+                   aspect='equal', origin='upper', rasterized=True)
+    ax.set_title(f'Heightmap (Terrain Colormap)\n{_elevation_title(meta)}', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Width (pixels)', fontsize=12)
+    ax.set_ylabel('Height (pixels)', fontsize=12)
+    cbar = plt.colorbar(im, ax=ax, label='Elevation (m)')
+    cbar.ax.tick_params(labelsize=10)
+    plt.savefig(output, dpi=DPI, facecolor='white')
+    plt.close(fig)
+    return output
+
+
+def _render_3d_surface(X, Y, elevation_downsampled, meta, output):
+    """Save a static 3D surface view."""
+    fig = plt.figure(figsize=(14, 10), layout='constrained')
+    ax = fig.add_subplot(111, projection='3d')
+    surf = plot_terrain_surface(ax, X, Y, elevation_downsampled, elevation_norm(*meta[:2]))
+    ax.set_title(f'3D Surface View\n{_elevation_title(meta)}', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Width (pixels)', fontsize=11)
+    ax.set_ylabel('Height (pixels)', fontsize=11)
+    ax.set_zlabel('Elevation (m)', fontsize=11)
+    cbar = plt.colorbar(surf, ax=ax, label='Elevation (m)', shrink=0.6, pad=0.1)
+    cbar.ax.tick_params(labelsize=10)
+    plt.savefig(output, dpi=DPI, facecolor='white')
+    plt.close(fig)
+    return output
+
+
+def _render_profiles(horizontal_profile, vertical_profile, center_row, center_col, meta, output):
+    """Save the elevation cross-sections through the center."""
+    min_elevation, max_elevation, _ = meta
+    fig, ax = plt.subplots(figsize=(12, 8), layout='constrained')
+    ax.plot(horizontal_profile, label=f'Horizontal (row {center_row})', linewidth=2.5, alpha=0.8)
+    ax.plot(vertical_profile, label=f'Vertical (col {center_col})', linewidth=2.5, alpha=0.8)
+    ax.set_title(f'Elevation Profiles (Cross-sections through center)\nElevation Range: {min_elevation:.0f}m - {max_elevation:.0f}m', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Position (pixels)', fontsize=12)
+    ax.set_ylabel('Elevation (m)', fontsize=12)
+    ax.legend(fontsize=11, loc='best')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    plt.savefig(output, dpi=DPI, facecolor='white')
+    plt.close(fig)
+    return output
 
 
 def visualize_raw(raw_path, width, height, min_elevation, max_elevation, variation,
-                  save_images=True, show_3d=False):
+                  save_images=True, show_3d=False, grid=DEFAULT_GRID):
     """
     Visualize the .raw file as a heightmap.
     
@@ -34,145 +205,131 @@ def visualize_raw(raw_path, width, height, min_elevation, max_elevation, variati
         min_elevation, max_elevation, variation: Elevation parameters
         save_images: If True, save 4 separate high-res images
         show_3d: If True, show interactive 3D visualization
+        grid: Target 3D surface grid size per side (positive int)
+    
+    Returns:
+        The full-resolution elevation array, or None if no images were saved
     """
-    print(f"\n{'='*70}")
-    print(f"🎨 Visualizing .raw file: {os.path.basename(raw_path)}")
-    print(f"{'='*70}")
+    _log(f"\n{'='*70}")
+    _log(f"🎨 Visualizing .raw file: {os.path.basename(raw_path)}")
+    _log(f"{'='*70}")
     
-    # Read .raw file
+    # Read .raw file (memory-mapped: only the samples used below are loaded)
     raw_data = read_raw_file(raw_path, width, height)
     
-    # Convert to normalized (0.0 to 1.0)
-    normalized = raw_data.astype(np.float32) / 65535.0
+    # Downsample for 3D visualization (every max(width, height) // grid-th
+    # sample, so roughly grid x grid for performance); terrains smaller than
+    # twice the grid are used at full resolution
+    if grid < 1:
+        raise ValueError(f"grid must be a positive integer, got {grid}")
+    downsample = max(1, max(width, height) // grid)
     
-    # Convert to real-world elevation (meters)
-    elevation = min_elevation + (normalized * variation)
+    if not save_images:
+        # 3D-only: read every downsample-th sample plus the two center lines.
+        # Only every downsample-th row is paged in, and the copies take
+        # ~1/downsample² of the memory; no full-size array is allocated
+        raw_sampled = np.ascontiguousarray(raw_data[::downsample, ::downsample])
+        center_row = np.array(raw_data[height // 2, :])
+        center_col = np.array(raw_data[:, width // 2])
+        elevation = None
+        elevation_downsampled = to_elevation(raw_sampled, min_elevation, variation)
+        stats_data = np.concatenate([raw_sampled.ravel(), center_row, center_col])
+        stats_label = f"Statistics (sampled every {downsample} px + center lines)"
+    else:
+        # Full-resolution elevation is needed for the saved images
+        elevation = to_elevation(raw_data, min_elevation, variation)
+        if downsample == 1:
+            elevation_downsampled = elevation
+        else:
+            # Block averaging commutes with the linear raw -> meters conversion, so
+            # the uint16 buffer is averaged first and only the small result is converted
+            elevation_downsampled = to_elevation(block_mean(raw_data, downsample),
+                                                 min_elevation, variation)
+        stats_data = raw_data
+        stats_label = "Statistics"
     
-    print(f"\n📊 Statistics:")
-    print(f"   Raw values: {np.min(raw_data):,} - {np.max(raw_data):,}")
-    print(f"   Elevation: {np.min(elevation):.2f}m - {np.max(elevation):.2f}m")
-    print(f"   Mean elevation: {np.mean(elevation):.2f}m")
+    # Elevation is a linear function of the raw values, so its statistics are
+    # derived from reductions over the (half as large) uint16 buffer
+    raw_min = int(stats_data.min())
+    raw_max = int(stats_data.max())
+    raw_mean = float(stats_data.mean())
+    elev_scale = variation / 65535.0
     
-    base_name = raw_path.replace('.raw', '')
+    _log(f"\n📊 {stats_label}:")
+    _log(f"   Raw values: {raw_min:,} - {raw_max:,}")
+    _log(f"   Elevation: {min_elevation + raw_min * elev_scale:.2f}m - {min_elevation + raw_max * elev_scale:.2f}m")
+    _log(f"   Mean elevation: {min_elevation + raw_mean * elev_scale:.2f}m")
     
-    # Pre-calculate variables needed for visualizations
-    center_row = height // 2
-    center_col = width // 2
-    horizontal_profile = elevation[center_row, :]
-    vertical_profile = elevation[:, center_col]
+    base_name = raw_path.replace('.raw', '')
     
-    # Downsample for 3D visualization (max 200x200 for performance)
-    downsample = max(1, max(width, height) // 200)
-    elevation_downsampled = elevation[::downsample, ::downsample]
     y_size, x_size = elevation_downsampled.shape
-    x_coords = np.arange(0, width, downsample)[:x_size]
-    y_coords = np.arange(0, height, downsample)[:y_size]
-    X, Y = np.meshgrid(x_coords, y_coords)
+    x_coords = np.arange(x_size) * downsample
+    y_coords = np.arange(y_size) * downsample
+    # Sparse grids (1 x W and H x 1): plot_surface broadcasts them itself,
+    # so the full 2D coordinate arrays are never materialized
+    X, Y = np.meshgrid(x_coords, y_coords, sparse=True, copy=False)
     
     # Save individual high-res images
     if save_images:
-        print(f"\n📸 Generating high-resolution images...")
-        
-        # 1. Heightmap (grayscale)
-        print(f"   1/4: Heightmap (Grayscale)...")
-        fig1, ax1 = plt.subplots(figsize=(12, 12))
-        im1 = ax1.imshow(elevation, cmap='gray', aspect='equal', origin='upper')
-        ax1.set_title(f'Heightmap (Grayscale)\nElevation: {min_elevation:.0f}m - {max_elevation:.0f}m (Range: {variation:.0f}m)', 
-                      fontsize=14, fontweight='bold', pad=20)
-        ax1.set_xlabel('Width (pixels)', fontsize=12)
-        ax1.set_ylabel('Height (pixels)', fontsize=12)
-        cbar1 = plt.colorbar(im1, ax=ax1, label='Elevation (m)', fraction=0.046, pad=0.04)
-        cbar1.ax.tick_params(labelsize=10)
-        plt.tight_layout()
-        output1 = f"{base_name}_01_heightmap_grayscale.png"
-        plt.savefig(output1, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close(fig1)
-        print(f"      ✓ Saved: {output1}")
+        _log(f"\n📸 Generating high-resolution images...")
+        meta = (min_elevation, max_elevation, variation)
+        center_row = height // 2
+        center_col = width // 2
+        horizontal_profile = elevation[center_row, :]
+        vertical_profile = elevation[:, center_col]
+        jobs = [
+            ("Heightmap (Grayscale)", _render_heightmap_gray,
+             ((raw_data >> 8).astype(np.uint8), f"{base_name}_01_heightmap_grayscale.png")),
+            ("Heightmap (Terrain Colormap)", _render_heightmap_terrain,
+             (elevation, meta, f"{base_name}_02_heightmap_terrain.png")),
+            ("3D Surface View", _render_3d_surface,
+             (X, Y, elevation_downsampled, meta, f"{base_name}_03_3d_surface.png")),
+            ("Elevation Profiles", _render_profiles,
+             (horizontal_profile, vertical_profile, center_row, center_col, meta,
+              f"{base_name}_04_elevation_profiles.png")),
+        ]
         
-        # 2. Heightmap (terrain colormap)
-        print(f"   2/4: Heightmap (Terrain Colormap)...")
-        fig2, ax2 = plt.subplots(figsize=(12, 12))
-        im2 = ax2.imshow(elevation, cmap='terrain', aspect='equal', origin='upper')
-        ax2.set_title(f'Heightmap (Terrain Colormap)\nElevation: {min_elevation:.0f}m - {max_elevation:.0f}m (Range: {variation:.0f}m)', 
-                      fontsize=14, fontweight='bold', pad=20)
-        ax2.set_xlabel('Width (pixels)', fontsize=12)
-        ax2.set_ylabel('Height (pixels)', fontsize=12)
-        cbar2 = plt.colorbar(im2, ax=ax2, label='Elevation (m)', fraction=0.046, pad=0.04)
-        cbar2.ax.tick_params(labelsize=10)
-        plt.tight_layout()
-        output2 = f"{base_name}_02_heightmap_terrain.png"
-        plt.savefig(output2, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close(fig2)
-        print(f"      ✓ Saved: {output2}")
+        # The four figures are independent CPU-bound renders, so each one
+        # gets its own process ('spawn' keeps the GUI backend out of workers)
+        outputs = []
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=len(jobs), mp_context=ctx,
+                                 initializer=_init_render_worker) as executor:
+            futures = [executor.submit(func, *args) for _, func, args in jobs]
+            for i, ((label, _, _), future) in enumerate(zip(jobs, futures), 1):
+                output = future.result()
+                outputs.append(output)
+                _log(f"   {i}/4: {label}...")
+                _log(f"      ✓ Saved: {output}")
         
-        # 3. 3D Surface
-        print(f"   3/4: 3D Surface View...")
-        fig3 = plt.figure(figsize=(14, 10))
-        ax3 = fig3.add_subplot(111, projection='3d')
-        surf = ax3.plot_surface(X, Y, elevation_downsampled, cmap='terrain', 
-                               linewidth=0, antialiased=True, alpha=0.9)
-        ax3.set_title(f'3D Surface View\nElevation: {min_elevation:.0f}m - {max_elevation:.0f}m (Range: {variation:.0f}m)', 
-                      fontsize=14, fontweight='bold', pad=20)
-        ax3.set_xlabel('Width (pixels)', fontsize=11)
-        ax3.set_ylabel('Height (pixels)', fontsize=11)
-        ax3.set_zlabel('Elevation (m)', fontsize=11)
-        cbar3 = plt.colorbar(surf, ax=ax3, label='Elevation (m)', shrink=0.6, pad=0.1)
-        cbar3.ax.tick_params(labelsize=10)
-        plt.tight_layout()
-        output3 = f"{base_name}_03_3d_surface.png"
-        plt.savefig(output3, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close(fig3)
-        print(f"      ✓ Saved: {output3}")
-        
-        # 4. Elevation profile
-        print(f"   4/4: Elevation Profiles...")
-        fig4, ax4 = plt.subplots(figsize=(12, 8))
-        ax4.plot(horizontal_profile, label=f'Horizontal (row {center_row})', linewidth=2.5, alpha=0.8)
-        ax4.plot(vertical_profile, label=f'Vertical (col {center_col})', linewidth=2.5, alpha=0.8)
-        ax4.set_title(f'Elevation Profiles (Cross-sections through center)\nElevation Range: {min_elevation:.0f}m - {max_elevation:.0f}m', 
-                      fontsize=14, fontweight='bold', pad=20)
-        ax4.set_xlabel('Position (pixels)', fontsize=12)
-        ax4.set_ylabel('Elevation (m)', fontsize=12)
-        ax4.legend(fontsize=11, loc='best')
-        ax4.grid(True, alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        output4 = f"{base_name}_04_elevation_profiles.png"
-        plt.savefig(output4, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close(fig4)
-        print(f"      ✓ Saved: {output4}")
-        
-        print(f"\n💾 All images saved (300 DPI):")
-        print(f"   1. {os.path.basename(output1)}")
-        print(f"   2. {os.path.basename(output2)}")
-        print(f"   3. {os.path.basename(output3)}")
-        print(f"   4. {os.path.basename(output4)}")
-        print(f"   Location: {os.path.dirname(os.path.abspath(output1))}")
+        _log(f"\n💾 All images saved ({DPI} DPI):")
+        for i, output in enumerate(outputs, 1):
+            _log(f"   {i}. {os.path.basename(output)}")
+        _log(f"   Location: {os.path.dirname(os.path.abspath(outputs[0]))}")
     
     # Show interactive 3D visualization
     if show_3d:
-        print(f"\n📺 Opening interactive 3D visualization...")
-        fig = plt.figure(figsize=(14, 10))
+        _log(f"\n📺 Opening interactive 3D visualization...")
+        fig = plt.figure(figsize=(14, 10), layout='constrained')
         ax = fig.add_subplot(111, projection='3d')
-        surf = ax.plot_surface(X, Y, elevation_downsampled, cmap='terrain', 
-                              linewidth=0, antialiased=True, alpha=0.9)
+        surf = plot_terrain_surface(ax, X, Y, elevation_downsampled,
+                                    elevation_norm(min_elevation, max_elevation))
         ax.set_title(f'Interactive 3D Terrain Surface\nElevation: {min_elevation:.0f}m - {max_elevation:.0f}m (Range: {variation:.0f}m)', 
                      fontsize=14, fontweight='bold', pad=20)
         ax.set_xlabel('Width (pixels)', fontsize=12)
         ax.set_ylabel('Height (pixels)', fontsize=12)
         ax.set_zlabel('Elevation (m)', fontsize=12)
         plt.colorbar(surf, ax=ax, label='Elevation (m)', shrink=0.6, pad=0.1)
-        plt.tight_layout()
-        print(f"   (You can rotate and zoom the 3D model. Close the window to continue)")
+        _log(f"   (You can rotate and zoom the 3D model. Close the window to continue)")
         plt.show()
     
     return elevation
 
 
+@lru_cache(maxsize=1)
 def get_default_example():
     """Get path to default example.tif file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    example_path = os.path.join(script_dir, '..', 'samples', 'example.tif')
-    return example_path if os.path.exists(example_path) else None
+    return _EXAMPLE_PATH if os.path.exists(_EXAMPLE_PATH) else None
 
 
 def main():
@@ -191,12 +348,12 @@ def main():
         print("💡 No arguments provided, using default: samples/example.tif")
         print("   Converting to .raw first...\n")
         
-        import subprocess
-        result = subprocess.run(
-            [sys.executable, 'pipeline.py', example_path],
-            cwd=os.path.dirname(__file__)
-        )
-        return result.returncode
+        # Run the pipeline in this interpreter (numpy/matplotlib are already
+        # loaded). The output path is explicit so it still lands next to the
+        # scripts, as it did when the pipeline was started as a subprocess.
+        from pipeline import main as pipeline_main
+        sys.argv = ['pipeline.py', example_path, os.path.join(_SCRIPT_DIR, 'example.raw')]
+        return pipeline_main()
     
     if len(sys.argv) < 6:
         print("❌ Error: Missing required arguments")
@@ -207,6 +364,8 @@ def main():
         print("\n💡 Options:")
         print("   --3d-only        Show only interactive 3D visualization (no images)")
         print("   --images-only    Save 4 high-res images only (no interactive window)")
+        print("   --quiet          Don't print progress messages")
+        print(f"   --grid=N         Target 3D grid size per side (default {DEFAULT_GRID}; lower is faster, coarser)")
         print("   (default)        Save images AND show interactive 3D")
         print("\n   Or use pipeline.py to convert and visualize automatically:")
         print("   python3 pipeline.py [input.tif]")
@@ -230,6 +389,9 @@ def main():
         # Default: both
         save_images = True
         show_3d = True
+    grid = parse_grid(sys.argv)
+    if grid is None:
+        return 1
     
     if not os.path.exists(raw_path):
         print(f"❌ Error: File not found: {raw_path}")
@@ -237,7 +399,7 @@ def main():
     
     try:
         elevation = visualize_raw(raw_path, width, height, min_elevation, max_elevation, variation,
-                                  save_images=save_images, show_3d=show_3d)
+                                  save_images=save_images, show_3d=show_3d, grid=grid)
         return 0
     except Exception as e:
         print(f"\n❌ Error: {e}")
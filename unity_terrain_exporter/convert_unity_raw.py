@@ -2,10 +2,11 @@
 # This is where the actual DEM processing will happen.
 
 # Python standard library imports
-import sys
 import os
 import numpy as np
 import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # QGIS imports
 from qgis.core import (
@@ -13,6 +14,9 @@ from qgis.core import (
     QgsProcessingAlgorithm,
     QgsProcessingParameterRasterLayer,
     QgsProcessingParameterFileDestination,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterFile,
+    QgsProcessingParameterFolderDestination,
     QgsProcessingFeedback,
 )
 
@@ -27,14 +31,71 @@ from osgeo import gdal, osr
 # --- Helper Function: UTM Zone Detection ---
 #
 
+@lru_cache(maxsize=16)
+def _transform_to_wgs84(source_wkt):
+    """
+    Returns a (cached) coordinate transformation from source_wkt to WGS84,
+    or None if source_wkt already is WGS84 (coordinates are lon/lat as-is).
+    
+    Building PROJ transformation pipelines involves proj.db lookups, which
+    are slow on PROJ >= 6, so one transformation is kept per source projection.
+    """
+    srs_origin = osr.SpatialReference(wkt=source_wkt)
+    if (srs_origin.IsGeographic() and srs_origin.GetAuthorityName(None) == "EPSG"
+            and srs_origin.GetAuthorityCode(None) == "4326"):
+        return None
+    
+    srs_wgs84 = osr.SpatialReference()
+    srs_wgs84.ImportFromEPSG(4326)
+    
+    # Ensure correct axis mapping (handles QGIS 3+ / GDAL 3+ changes)
+    if int(gdal.__version__[0]) >= 3:
+        srs_origin.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        srs_wgs84.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    
+    return osr.CoordinateTransformation(srs_origin, srs_wgs84)
+
+
+@lru_cache(maxsize=16)
+def _source_utm_epsg(source_wkt):
+    """
+    Returns the EPSG code (int) of source_wkt if it is a WGS84 UTM zone
+    (32601-32660 / 32701-32760), otherwise None. Cached per projection.
+    """
+    srs = osr.SpatialReference(wkt=source_wkt)
+    if srs.IsProjected() and srs.GetAuthorityName(None) == "EPSG":
+        epsg_num = int(srs.GetAuthorityCode(None) or 0)
+        if (32601 <= epsg_num <= 32660) or (32701 <= epsg_num <= 32760):
+            return epsg_num
+    return None
+
+
+def clear_caches():
+    """
+    Drops the cached PROJ transformations and projection lookups (called
+    when the plugin's provider is unloaded).
+    """
+    _transform_to_wgs84.cache_clear()
+    _source_utm_epsg.cache_clear()
+
+
 def get_utm_epsg_code(dataset, feedback: QgsProcessingFeedback):
     """
     Calculates the correct UTM EPSG code for the center of the dataset.
+    
+    Datasets that are already in a UTM zone keep that zone (no PROJ
+    transformation is needed, and it avoids reprojecting UTM input).
     """
     try:
         # 1. Get the geotransform and source projection
         gt = dataset.GetGeoTransform()
-        srs_origin = osr.SpatialReference(wkt=dataset.GetProjection())
+        source_wkt = dataset.GetProjection()
+        
+        # Already UTM: keep the source zone
+        source_epsg = _source_utm_epsg(source_wkt)
+        if source_epsg is not None:
+            feedback.pushConsoleInfo(f"Input is already in UTM: EPSG:{source_epsg}")
+            return f"EPSG:{source_epsg}"
         
         # 2. Calculate center pixel coordinate
         x_center_pixel = dataset.RasterXSize / 2
@@ -44,27 +105,23 @@ def get_utm_epsg_code(dataset, feedback: QgsProcessingFeedback):
         x_center_world = gt[0] + (x_center_pixel * gt[1]) + (y_center_pixel * gt[2])
         y_center_world = gt[3] + (x_center_pixel * gt[4]) + (y_center_pixel * gt[5])
 
-        # 4. Create transformation to WGS84 (EPSG:4326) to get lon/lat
-        srs_wgs84 = osr.SpatialReference()
-        srs_wgs84.ImportFromEPSG(4326)
+        # 4. Get the transformation to WGS84 (EPSG:4326) to get lon/lat
+        # (cached per source projection)
+        transform = _transform_to_wgs84(source_wkt)
         
-        # 5. Ensure correct axis mapping (handles QGIS 3+ / GDAL 3+ changes)
-        if int(gdal.__version__[0]) >= 3:
-            srs_origin.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-            srs_wgs84.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-
-        transform = osr.CoordinateTransformation(srs_origin, srs_wgs84)
-        
-        # 6. Transform the point
-        point = transform.TransformPoint(x_center_world, y_center_world)
-        lon = point[0]
-        lat = point[1]
+        # 5. Transform the point (WGS84 input is already lon/lat)
+        if transform is None:
+            lon, lat = x_center_world, y_center_world
+        else:
+            point = transform.TransformPoint(x_center_world, y_center_world)
+            lon = point[0]
+            lat = point[1]
 
-        # 7. Calculate UTM zone
+        # 6. Calculate UTM zone
         # UTM zones are 1-60
         utm_zone = math.floor((lon + 180) / 6) + 1
         
-        # 8. Determine hemisphere and base EPSG code
+        # 7. Determine hemisphere and base EPSG code
         # 32600 for Northern Hemisphere, 32700 for Southern
         if lat >= 0:
             epsg_code = 32600 + utm_zone
@@ -84,7 +141,7 @@ def get_utm_epsg_code(dataset, feedback: QgsProcessingFeedback):
 # --- Helper Function: Calculate Terrain Dimensions ---
 #
 
-def calculate_terrain_dimensions(dataset, cols, rows):
+def calculate_terrain_dimensions(gt, cols, rows):
     """
     Calculates the actual terrain dimensions (X and Z) in world coordinates.
     
@@ -99,7 +156,7 @@ def calculate_terrain_dimensions(dataset, cols, rows):
     Uses geotransform values rather than projection metadata, as metadata can be incorrect.
 
     Args:
-        dataset: GDAL dataset (already cropped to final size)
+        gt: GDAL geotransform of the final (cropped) raster
         cols: number of columns (width) in pixels
         rows: number of rows (height) in pixels
     
@@ -110,20 +167,14 @@ def calculate_terrain_dimensions(dataset, cols, rows):
     METERS_PER_DEGREE_LATITUDE = 111320.0  # Approximately constant worldwide
     PIXEL_SQUARE_TOLERANCE = 0.0001  # Tolerance for floating-point comparison
     
-    gt = dataset.GetGeoTransform()
-    
-    # Calculate corner coordinates in world space
-    # Top-left corner
-    top_left_x = gt[0]
-    top_left_y = gt[3]
-    
-    # Top-right corner (moving along X-axis: cols pixels in X direction)
-    top_right_x = gt[0] + (cols * gt[1]) + (0 * gt[2])
-    top_right_y = gt[3] + (cols * gt[4]) + (0 * gt[5])
-    
-    # Bottom-left corner (moving along Y-axis: rows pixels in Y direction)
-    bottom_left_x = gt[0] + (0 * gt[1]) + (rows * gt[2])
-    bottom_left_y = gt[3] + (0 * gt[4]) + (rows * gt[5])
+    # Edge vectors of the raster in world space: the top edge spans cols pixels
+    # along the column direction (gt[1], gt[4]), the left edge spans rows pixels
+    # along the row direction (gt[2], gt[5])
+    top_left_x, top_left_y = gt[0], gt[3]
+    edge_x = (cols * gt[1], cols * gt[4])
+    edge_z = (rows * gt[2], rows * gt[5])
+    top_right_x = top_left_x + edge_x[0]
+    bottom_left_y = top_left_y + edge_z[1]
     
     # Detect if coordinates are in degrees (geographic) vs meters (projected)
     # Use heuristics based on geotransform values (most reliable, as metadata can be incorrect)
@@ -148,9 +199,9 @@ def calculate_terrain_dimensions(dataset, cols, rows):
         # For geographic coordinates, calculate longitude and latitude spans separately
         # X dimension: longitude span (in degrees)
         # Note: Using abs() assumes no significant rotation (typical for geographic data)
-        lon_span = abs(top_right_x - top_left_x)
+        lon_span = abs(edge_x[0])
         # Z dimension: latitude span (in degrees)
-        lat_span = abs(bottom_left_y - top_left_y)
+        lat_span = abs(edge_z[1])
         
         # Calculate center latitude for accurate longitude-to-meters conversion
         # Longitude-to-meters conversion varies with latitude: meters = degrees * 111320 * cos(latitude)
@@ -173,16 +224,16 @@ def calculate_terrain_dimensions(dataset, cols, rows):
         # For projected coordinates (meters), calculate actual distance between corners
         # This accounts for any rotation in the geotransform
         # X dimension: distance between top-left and top-right
-        terrain_size_x = math.sqrt((top_right_x - top_left_x)**2 + (top_right_y - top_left_y)**2)
+        terrain_size_x = math.hypot(*edge_x)
         # Z dimension: distance between top-left and bottom-left
-        terrain_size_z = math.sqrt((bottom_left_x - top_left_x)**2 + (bottom_left_y - top_left_y)**2)
+        terrain_size_z = math.hypot(*edge_z)
         
         # If image is square AND pixels are square, X and Z must be equal
         # If image is square but pixels are not square, X and Z will differ (common after reprojection)
         # Check if pixel is square: For square pixels, the magnitude of X-direction vector should
         # equal the magnitude of Z-direction vector
-        pixel_scale_x = math.sqrt(gt[1]**2 + gt[4]**2)  # magnitude of X-direction vector
-        pixel_scale_z = math.sqrt(gt[2]**2 + gt[5]**2)  # magnitude of Z-direction vector
+        pixel_scale_x = math.hypot(gt[1], gt[4])  # magnitude of X-direction vector
+        pixel_scale_z = math.hypot(gt[2], gt[5])  # magnitude of Z-direction vector
         pixels_are_square = abs(pixel_scale_x - pixel_scale_z) < PIXEL_SQUARE_TOLERANCE
         
         if cols == rows and pixels_are_square:
@@ -194,10 +245,106 @@ def calculate_terrain_dimensions(dataset, cols, rows):
         return terrain_size_x, terrain_size_z
 
 
+#
+# --- Helper Function: Structured Metrics ---
+#
+
+def report_metric(feedback, key, value):
+    """
+    Pass a numeric result to the feedback object, if it supports it.
+    
+    Feedback objects with a report_metric(key, value) method (e.g. the
+    MockFeedback used by the tools/ scripts) receive the values directly
+    instead of having to parse them back out of the console log.
+    QgsProcessingFeedback has no such method, so QGIS is unaffected.
+    """
+    if hasattr(feedback, 'report_metric'):
+        feedback.report_metric(key, value)
+
+
 #
 # --- Helper Function: Padding Detection ---
 #
 
+def padding_regions(rows, cols):
+    """
+    Returns the regions compared by the padding check.
+    
+    Returns:
+        tuple: (border_size, center_start, center_end)
+            - border_size: width of the border strip (outer 5% of each dimension, at least 5 px)
+            - center_start, center_end: bounds of the center region (inner 50%)
+    """
+    border_size = max(5, min(cols, rows) // 20)
+    center_start = rows // 4
+    center_end = 3 * rows // 4
+    return border_size, center_start, center_end
+
+
+def count_padding_zeros(zero_mask, row_offset, rows, cols, regions):
+    """
+    Counts zeros in one horizontal stripe of the image for the padding check.
+    
+    Args:
+        zero_mask: boolean array (stripe rows x cols) marking zero pixels
+        row_offset: index of the stripe's first row in the full image
+        rows: number of rows in the full image
+        cols: number of columns in the full image
+        regions: result of padding_regions(rows, cols)
+    
+    Returns:
+        tuple: (zeros, interior_zeros, center_zeros) for this stripe, where the
+        interior is everything inside the border strip. Summing the tuples of all
+        stripes gives the counts for the full image.
+    """
+    border_size, center_start, center_end = regions
+    stripe_rows = zero_mask.shape[0]
+    
+    def local(start, stop):
+        # Clip full-image row bounds to this stripe
+        return (min(max(start - row_offset, 0), stripe_rows),
+                min(max(stop - row_offset, 0), stripe_rows))
+    
+    i0, i1 = local(border_size, rows - border_size)
+    c0, c1 = local(center_start, center_end)
+    return (np.count_nonzero(zero_mask),
+            np.count_nonzero(zero_mask[i0:i1, border_size:cols - border_size]),
+            np.count_nonzero(zero_mask[c0:c1, center_start:center_end]))
+
+
+def is_border_padding(zero_count, interior_zeros, center_zeros, rows, cols, regions):
+    """
+    Decides from zero counts whether the zeros are border padding.
+    
+    Padding typically appears in corners/edges after rotation or cropping.
+    It is detected when the border has >30% zeros AND >3x the zero density
+    of the center region (or the center has no zeros at all).
+    
+    Returns:
+        bool: True if the zeros should be treated as padding
+    """
+    # If there are no zeros, or all pixels are zero, no padding to detect
+    total = rows * cols
+    if zero_count == 0 or zero_count == total:
+        return False
+    
+    border_size, center_start, center_end = regions
+    
+    # Border = everything outside the interior rectangle, so its zeros are
+    # total zeros minus interior zeros (no full-size region masks needed)
+    interior_total = len(range(rows)[border_size:rows - border_size]) * \
+        len(range(cols)[border_size:cols - border_size])
+    border_total = total - interior_total
+    border_zero_ratio = (zero_count - interior_zeros) / border_total if border_total > 0 else 0
+    
+    center_total = (center_end - center_start) * len(range(cols)[center_start:center_end])
+    center_zero_ratio = center_zeros / center_total if center_total > 0 else 0
+    
+    # If border has significantly more zeros than center, likely padding
+    # Threshold: border has >3x more zeros than center, AND border has >30% zeros
+    return border_zero_ratio > 0.3 and (center_zero_ratio == 0 or border_zero_ratio > 3 * center_zero_ratio)
+
+
 def detect_and_exclude_padding(data, mask, rows, cols):
     """
     Detects zero-value padding in image borders and excludes it from the mask.
@@ -217,54 +364,184 @@ def detect_and_exclude_padding(data, mask, rows, cols):
             - padding_detected: True if padding was detected and excluded
     """
     zero_mask = data == 0
-    zero_count = zero_mask.sum()
-    non_zero_count = (~zero_mask).sum()
+    regions = padding_regions(rows, cols)
+    counts = count_padding_zeros(zero_mask, 0, rows, cols, regions)
     
-    # If there are no zeros, or all pixels are zero, no padding to detect
-    if zero_count == 0 or non_zero_count == 0:
-        return mask, False
+    if is_border_padding(*counts, rows, cols, regions):
+        # Exclude zeros from valid mask
+        updated_mask = mask & ~zero_mask
+        return updated_mask, True
     
-    # Define border region (outer 5% of each dimension)
-    border_size = max(5, min(cols, rows) // 20)
+    # No padding detected - zeros appear to be valid terrain (e.g., sea level)
+    return mask, False
+
+
+#
+# --- Helper Function: Height Range ---
+#
+
+def masked_min_max(data, mask, count):
+    """
+    Min and max of data where mask is True, without copying the selected
+    pixels out (data[mask] would allocate a new array for each reduction).
     
-    # Create border mask (all pixels within border_size from edges)
-    border_mask = np.zeros_like(data, dtype=bool)
-    border_mask[:border_size, :] = True  # top
-    border_mask[-border_size:, :] = True  # bottom
-    border_mask[:, :border_size] = True  # left
-    border_mask[:, -border_size:] = True  # right
+    Args:
+        data: numpy array of height values (any numeric dtype)
+        mask: boolean mask of valid pixels
+        count: number of True values in mask (must be > 0)
     
-    # Define center region (inner 50% of each dimension)
-    center_start = rows // 4
-    center_end = 3 * rows // 4
-    center_mask = np.zeros_like(data, dtype=bool)
-    center_mask[center_start:center_end, center_start:center_end] = True
+    Returns:
+        tuple: (min, max) of the valid pixels
+    """
+    if count == mask.size:
+        return data.min(), data.max()
     
-    # Calculate zero ratios
-    border_zeros = np.sum(zero_mask & border_mask)
-    border_total = np.sum(border_mask)
-    border_zero_ratio = border_zeros / border_total if border_total > 0 else 0
+    # Identity values for the masked reductions, representable in data's dtype
+    if np.issubdtype(data.dtype, np.integer):
+        info = np.iinfo(data.dtype)
+        lowest, highest = info.min, info.max
+    else:
+        lowest, highest = -np.inf, np.inf
+    return (np.min(data, where=mask, initial=highest),
+            np.max(data, where=mask, initial=lowest))
+
+
+#
+# --- Helper Function: Normalization ---
+#
+
+# Unity .raw sample type: 16-bit unsigned, little-endian ("Windows" byte order).
+# Arrays of this dtype hold little-endian bytes on any host, so tofile() or a
+# memmap of it always produces the layout Unity expects, with no byteswap.
+UNITY_RAW_DTYPE = np.dtype('<u2')
+
+
+def normalize_to_uint16(data, min_height, max_height, out=None):
+    """
+    Scales heights to Unity's 16-bit range (0 = min_height, 65535 = max_height).
     
-    center_zeros = np.sum(zero_mask & center_mask)
-    center_total = np.sum(center_mask)
-    center_zero_ratio = center_zeros / center_total if center_total > 0 else 0
+    The arithmetic runs in place on float data (one float32 buffer, no
+    temporaries, two passes), so the caller's array is overwritten. Integer
+    data is left untouched: it is converted to float32 by the subtraction
+    itself, which writes a new float32 buffer (no separate astype pass).
     
-    # If border has significantly more zeros than center, likely padding
-    # Threshold: border has >3x more zeros than center, AND border has >30% zeros
-    if border_zero_ratio > 0.3 and (center_zero_ratio == 0 or border_zero_ratio > 3 * center_zero_ratio):
-        # Exclude zeros from valid mask
-        updated_mask = mask & ~zero_mask
-        return updated_mask, True
+    Args:
+        data: numpy array of height values (float32 or an integer dtype),
+            padding/NoData already filled
+        min_height: minimum valid height
+        max_height: maximum valid height
+        out: optional 16-bit array (same shape as data) to store the result in,
+            e.g. a slice of the memory-mapped output file
     
-    # No padding detected - zeros appear to be valid terrain (e.g., sea level)
-    return mask, False
+    Returns:
+        numpy array (UNITY_RAW_DTYPE) with the normalized heights (out, if given)
+    """
+    if max_height == min_height:
+        # Flat terrain: everything maps to 0
+        if out is None:
+            return np.zeros(data.shape, dtype=UNITY_RAW_DTYPE)
+        out[...] = 0
+        return out
+    
+    # Two in-place passes: subtract the minimum, multiply by a precomputed
+    # scale. The range is taken in data's own dtype so it matches what the
+    # highest pixel becomes after the subtraction; the scale is nudged up if
+    # needed so that pixel still lands on 65535 rather than truncating to 65534.
+    float_type = data.dtype.type if data.dtype.kind == 'f' else np.float32
+    height_range = float_type(max_height) - float_type(min_height)
+    scale = float_type(65535.0 / float(height_range))
+    if height_range * scale < 65535:
+        scale = np.nextafter(scale, float_type(np.inf))
+    if data.dtype.kind == 'f':
+        data -= min_height
+    else:
+        data = np.subtract(data, np.float32(min_height), dtype=np.float32)
+    data *= scale
+    if out is None:
+        return data.astype(UNITY_RAW_DTYPE)
+    np.copyto(out, data, casting='unsafe')
+    return out
+
+
+#
+# --- Helper Function: Striped Reading ---
+#
+
+# Target number of pixels per stripe (16 MB as float32)
+STRIPE_PIXELS = 4 * 1024 * 1024
+
+# GDAL block cache size while converting (only ever raised, and restored
+# afterwards). Big enough to keep a typical DEM's decoded blocks between the
+# two passes, so pass 2 doesn't decompress every block again.
+GDAL_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def stripe_height(band, cols):
+    """
+    Number of rows to read per stripe: about STRIPE_PIXELS pixels, rounded to
+    whole GDAL blocks so each block is decoded only once per pass.
+    """
+    block_rows = max(1, band.GetBlockSize()[1])
+    blocks = max(1, STRIPE_PIXELS // (cols * block_rows))
+    return blocks * block_rows
+
+
+def iter_stripes(band, x_offset, y_offset, rows, cols, stripe_rows, buf_type=None):
+    """
+    Yields (row_offset, data) for consecutive full-width stripes of the
+    rows x cols window at (x_offset, y_offset), top to bottom, with data in
+    the band's native dtype (or buf_type, converted by GDAL while reading)
+    and row_offset relative to the window.
+    
+    All stripes are read into one buffer, so each one is only valid until
+    the next is yielded (callers may modify it in place).
+    """
+    buffer = None
+    for row_offset in range(0, rows, stripe_rows):
+        height = min(stripe_rows, rows - row_offset)
+        if buffer is None:
+            buffer = band.ReadAsArray(x_offset, y_offset + row_offset, cols, height, buf_type=buf_type)
+            yield row_offset, buffer
+        else:
+            yield row_offset, band.ReadAsArray(x_offset, y_offset + row_offset, cols, height,
+                                               buf_obj=buffer[:height])
 
 
 #
 # --- Helper Function: Core Processing Logic ---
 #
 
-def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessingFeedback):
+def _apply_gdal_settings():
+    """
+    Raises the GDAL block cache and turns off directory scans on open, if
+    needed. GDAL settings are process-wide (shared with QGIS), so the previous
+    state is returned to be put back with _restore_gdal_settings.
+    """
+    previous_cache = None
+    if gdal.GetCacheMax() < GDAL_CACHE_BYTES:
+        previous_cache = gdal.GetCacheMax()
+        gdal.SetCacheMax(GDAL_CACHE_BYTES)
+    # Don't list the input's folder on open (slow for big or network folders)
+    readdir_set = False
+    if gdal.GetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN') is None:
+        gdal.SetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN', 'TRUE')
+        readdir_set = True
+    return previous_cache, readdir_set
+
+
+def _restore_gdal_settings(state):
+    """
+    Undoes the changes made by _apply_gdal_settings (state is its return value).
+    """
+    previous_cache, readdir_set = state
+    if previous_cache is not None:
+        gdal.SetCacheMax(previous_cache)
+    if readdir_set:
+        gdal.SetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN', None)
+
+
+def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessingFeedback,
+                              detect_padding=True, _gdal_settings=True):
     """
     Runs the full workflow:
     1. Square Crop (Center) - only if necessary
@@ -273,18 +550,26 @@ def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessi
     
     Note: Input should be pre-reprojected to UTM projection for best results.
     The plugin assumes the input is already in the desired projection.
+    
+    If detect_padding is False, step 2 is skipped and zeros are always
+    treated as valid terrain (saves the zero scans on large batch runs).
+    
+    _gdal_settings is internal: process_batch applies the GDAL settings once
+    around all of its workers and passes False, so the per-file calls don't
+    change (and restore) them while other files are still being read.
     """
     
-    # Use GDAL's in-memory file system for intermediate files
-    temp_cropped_path = f"/vsimem/{os.path.basename(input_path)}_cropped.tif"
-
     dataset = None
-    cropped_ds = None
+    gdal_state = None
 
     try:
         # Enable GDAL exceptions for better debugging
         gdal.UseExceptions()
         
+        # Larger block cache, no directory scans (put back in the finally block below)
+        if _gdal_settings:
+            gdal_state = _apply_gdal_settings()
+        
         # 0. Open the input file
         dataset = gdal.Open(input_path, gdal.GA_ReadOnly)
         if not dataset:
@@ -294,50 +579,38 @@ def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessi
         feedback.pushConsoleInfo(f"--- Processing: {os.path.basename(input_path)} ---")
 
         # 1. CALCULATE SQUARE CROP (from center)
+        # The crop is not materialized: only the centered square window is
+        # read from the band, and its geotransform is derived from the original.
         cols = dataset.RasterXSize
         rows = dataset.RasterYSize
         min_dim = min(cols, rows)
         is_square = (cols == rows)
         
+        # Calculate offset to crop from the center (zero for square images)
+        x_offset = (cols - min_dim) // 2
+        y_offset = (rows - min_dim) // 2
+        
         if is_square:
             feedback.pushConsoleInfo(f"Image is already square ({cols}x{rows}). Skipping crop.")
-            # Use the original dataset directly
-            cropped_ds = dataset
-            dataset = None  # Don't close it yet, cropped_ds references it
         else:
-            # Calculate offset to crop from the center
-            x_offset = (cols - min_dim) // 2
-            y_offset = (rows - min_dim) // 2
-            
             feedback.pushConsoleInfo(f"Original dimensions: {cols}x{rows}. Cropping to {min_dim}x{min_dim} from center.")
-
-            # Execute the crop (gdal.Translate) to the in-memory file
-            gdal.Translate(temp_cropped_path, 
-                             dataset, 
-                             srcWin=[x_offset, y_offset, min_dim, min_dim],
-                             format="GTiff")
-            
-            # Close original dataset
-            dataset = None 
-            
-            # Open the newly cropped dataset (from memory)
-            cropped_ds = gdal.Open(temp_cropped_path, gdal.GA_ReadOnly)
+        
+        # Geotransform of the cropped window: origin moved to its top-left pixel
+        gt = dataset.GetGeoTransform()
+        cropped_gt = (gt[0] + x_offset * gt[1] + y_offset * gt[2], gt[1], gt[2],
+                      gt[3] + x_offset * gt[4] + y_offset * gt[5], gt[4], gt[5])
         
         # 2. VALIDATE PROJECTION (Optional Warning)
         # Check if input is in UTM projection (informational only, non-blocking)
-        current_srs = osr.SpatialReference(wkt=cropped_ds.GetProjection())
+        source_wkt = dataset.GetProjection()
+        current_srs = osr.SpatialReference(wkt=source_wkt)
         srs_name = current_srs.GetName() if current_srs.GetName() else "Unknown"
         
         # Check if it's a UTM projection (EPSG codes 32601-32660 for North, 32701-32760 for South)
-        is_utm = False
-        if current_srs.GetAuthorityName(None) == "EPSG":
-            epsg_code = current_srs.GetAuthorityCode(None)
-            if epsg_code:
-                epsg_num = int(epsg_code)
-                # UTM Northern Hemisphere: 32601-32660, Southern Hemisphere: 32701-32760
-                if (32601 <= epsg_num <= 32660) or (32701 <= epsg_num <= 32760):
-                    is_utm = True
-                    feedback.pushConsoleInfo(f"Input projection: {srs_name} (EPSG:{epsg_code}) - UTM detected ✓")
+        utm_epsg = _source_utm_epsg(source_wkt)
+        is_utm = utm_epsg is not None
+        if is_utm:
+            feedback.pushConsoleInfo(f"Input projection: {srs_name} (EPSG:{utm_epsg}) - UTM detected ✓")
         
         if not is_utm:
             feedback.pushConsoleInfo(f"Warning: Input projection appears to be {srs_name} (not UTM).")
@@ -345,47 +618,113 @@ def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessi
             feedback.pushConsoleInfo("Processing will continue, but Unity import may require manual scaling.")
 
         # 3. CONVERT TO UNITY .RAW (16-BIT)
-        band = cropped_ds.GetRasterBand(1)
-        final_cols = cropped_ds.RasterXSize
-        final_rows = cropped_ds.RasterYSize
-        
-        data = band.ReadAsArray().astype(np.float32)
+        # The raster is streamed in horizontal stripes (two passes), so peak
+        # memory is a few stripes instead of several full-size arrays
+        band = dataset.GetRasterBand(1)
+        final_cols = min_dim
+        final_rows = min_dim
+        stripe_rows = stripe_height(band, final_cols)
+        # Float64 DEMs are converted to float32 by GDAL while reading (heights
+        # end up as float32 anyway); other types are read in their own dtype
+        read_type = gdal.GDT_Float32 if band.DataType == gdal.GDT_Float64 else None
         
         # Handle NoData values and calculate height range
         # Note: min_height may not be 0 if terrain starts above sea level
         nodata_value = band.GetNoDataValue()
         
-        # Create initial mask for valid terrain pixels (exclude NoData)
-        if nodata_value is not None:
-            mask = data != nodata_value
-        else:
-            mask = np.ones_like(data, dtype=bool)
+        # Pass 1: height range and padding statistics.
+        # Whether zeros are padding is only known after the whole image has been
+        # seen, so the range of valid non-zero pixels and the valid zeros are
+        # tracked separately and combined afterwards. Stripes stay in the band's
+        # native dtype here; min/max and comparisons don't need float32.
+        regions = padding_regions(final_rows, final_cols)
+        zero_counts = np.zeros(3, dtype=np.int64)
+        nonzero_count = 0
+        valid_zero_count = 0
+        min_height = np.float32(np.inf)
+        max_height = np.float32(-np.inf)
+        stripes = iter_stripes(band, x_offset, y_offset, final_rows, final_cols, stripe_rows, read_type)
+        
+        range_from_metadata = False
+        if is_square and not detect_padding:
+            # The whole band is used and no zero counts are needed, so the
+            # band's stored statistics (if exact) or GDAL's exact min/max
+            # (a C loop that skips NoData) replace pass 1. Stored statistics
+            # are only trusted when GDAL wrote them from a full scan
+            # (STATISTICS_VALID_PERCENT set, not flagged approximate).
+            stripes = ()
+            stored_min, stored_max = band.GetMinimum(), band.GetMaximum()
+            if (stored_min is not None and stored_max is not None
+                    and band.GetMetadataItem('STATISTICS_VALID_PERCENT') is not None
+                    and band.GetMetadataItem('STATISTICS_APPROXIMATE') != 'YES'):
+                min_height, max_height = stored_min, stored_max
+                nonzero_count = final_rows * final_cols
+                range_from_metadata = True
+            else:
+                try:
+                    min_height, max_height = band.ComputeRasterMinMax(False)
+                    nonzero_count = final_rows * final_cols
+                except RuntimeError:
+                    # Raised when every pixel is NoData
+                    pass
+        
+        for row_offset, stripe in stripes:
+            if not detect_padding:
+                # Zeros are plain terrain: only NoData is excluded
+                if nodata_value is None:
+                    nonzero_count += stripe.size
+                    min_height = np.minimum(min_height, stripe.min())
+                    max_height = np.maximum(max_height, stripe.max())
+                    continue
+                valid = stripe != nodata_value
+            else:
+                zero_mask = stripe == 0
+                zero_counts += count_padding_zeros(zero_mask, row_offset, final_rows, final_cols, regions)
+                
+                # Create mask for valid terrain pixels (exclude NoData)
+                if nodata_value is not None:
+                    valid = stripe != nodata_value
+                    valid_zero_count += np.count_nonzero(zero_mask & valid)
+                    valid &= ~zero_mask
+                else:
+                    valid_zero_count += np.count_nonzero(zero_mask)
+                    valid = ~zero_mask
+            
+            count = np.count_nonzero(valid)
+            if count:
+                nonzero_count += count
+                stripe_min, stripe_max = masked_min_max(stripe, valid, count)
+                min_height = np.minimum(min_height, stripe_min)
+                max_height = np.maximum(max_height, stripe_max)
         
         # Detect and exclude zero-value padding from borders
-        mask, padding_detected = detect_and_exclude_padding(data, mask, final_rows, final_cols)
+        padding_detected = detect_padding and is_border_padding(*zero_counts, final_rows, final_cols, regions)
+        valid_count = nonzero_count
+        if not padding_detected and valid_zero_count:
+            # Zeros are valid terrain (e.g., sea level)
+            valid_count += valid_zero_count
+            min_height = np.minimum(min_height, np.float32(0))
+            max_height = np.maximum(max_height, np.float32(0))
         
         # Check if we have any valid pixels
-        if not mask.any():
+        if valid_count == 0:
             feedback.pushConsoleInfo("Error: No valid terrain pixels found after filtering.")
             return False
         
-        # Calculate min/max from valid terrain pixels only
-        min_height = np.min(data[mask])
-        max_height = np.max(data[mask])
-        
-        # Fill excluded pixels with minimum height to avoid gaps in output
-        data[~mask] = min_height
+        # Heights are handled as float32 from here on (exact for 16-bit DEMs)
+        min_height = np.float32(min_height)
+        max_height = np.float32(max_height)
         
         terrain_height_variation = max_height - min_height
         
         # Display padding info (if detected)
         if padding_detected:
-            excluded_count = (~mask).sum()
+            excluded_count = final_rows * final_cols - valid_count
             feedback.pushConsoleInfo(f"⚠ Padding detected in borders and excluded from height calculation ({excluded_count:,} pixels)")
         
         # Calculate terrain dimensions in meters (for Unity's Terrain Size X and Z)
         # This only works accurately if the input is in UTM projection (metric units)
-        terrain_size_x, terrain_size_z = calculate_terrain_dimensions(cropped_ds, final_cols, final_rows)
+        terrain_size_x, terrain_size_z = calculate_terrain_dimensions(cropped_gt, final_cols, final_rows)
         
         # Display Unity import settings (suggested values)
         feedback.pushConsoleInfo(f"\n--- Suggested Unity Import Settings ---")
@@ -405,30 +744,58 @@ def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessi
         feedback.pushConsoleInfo(f"  Min Height: {min_height:.2f}m")
         feedback.pushConsoleInfo(f"  Max Height: {max_height:.2f}m")
         
-        # Normalize (0.0 to 1.0) and scale (0 to 65535)
-        # Unity expects: 0 = minimum height, 65535 = maximum height
-        if max_height == min_height:
-            data_uint16 = np.zeros_like(data, dtype=np.uint16)
-        else:
-            data_normalized = (data - min_height) / terrain_height_variation
-            data_uint16 = (data_normalized * 65535).astype(np.uint16)
+        report_metric(feedback, 'width', final_cols)
+        report_metric(feedback, 'height', final_rows)
+        report_metric(feedback, 'terrain_size_x', float(terrain_size_x))
+        report_metric(feedback, 'terrain_size_z', float(terrain_size_z))
+        report_metric(feedback, 'variation', float(terrain_height_variation))
+        report_metric(feedback, 'min_height', float(min_height))
+        report_metric(feedback, 'max_height', float(max_height))
         
-        # Ensure array is contiguous in memory (C-order, row-major)
-        # This matches the .bil format: Band Interleaved by Line
-        if not data_uint16.flags['C_CONTIGUOUS']:
-            data_uint16 = np.ascontiguousarray(data_uint16, dtype=np.uint16)
-            
-        # Ensure Little Endian byte order (Windows/Unity default)
-        # Unity import settings: Byte Order = "Windows" (Little Endian)
-        if sys.byteorder == 'big':
-            data_uint16.byteswap(inplace=True)
-
         # 4. SAVE THE FINAL .RAW FILE
         # Format: 16-bit unsigned integer, Little Endian, row-major (top-to-bottom)
         # No header - raw binary data only (same as .bil format)
         # Unity import: Depth = 16 bit, Byte Order = Windows, Resolution = width x height
-        with open(output_raw_path, 'wb') as f:
-            data_uint16.tofile(f)
+        # Pass 2: stripes are normalized straight into the memory-mapped
+        # output file (little-endian whatever the host byte order is)
+        raw = np.memmap(output_raw_path, dtype=UNITY_RAW_DTYPE, mode='w+', shape=(final_rows, final_cols))
+        clipped_count = 0
+        try:
+            for row_offset, stripe in iter_stripes(band, x_offset, y_offset, final_rows, final_cols, stripe_rows, read_type):
+                # Fill excluded pixels with minimum height to avoid gaps in output
+                invalid = stripe == 0 if padding_detected else None
+                if nodata_value is not None:
+                    nodata_mask = stripe == nodata_value
+                    invalid = nodata_mask if invalid is None else invalid | nodata_mask
+                # Integer stripes stay in their native dtype (the float32
+                # conversion happens inside normalize_to_uint16's subtraction),
+                # unless they need clipping to a possibly fractional stored range
+                if stripe.dtype.kind == 'f' or range_from_metadata:
+                    stripe = stripe.astype(np.float32, copy=False)
+                if invalid is not None:
+                    # Masked store (no index array, unlike stripe[invalid] = ...)
+                    np.copyto(stripe, stripe.dtype.type(min_height), where=invalid)
+                if range_from_metadata:
+                    # Stored statistics may be stale; keep values inside the
+                    # range so they can't wrap around in the 16-bit cast
+                    clipped_count += (np.count_nonzero(stripe < min_height)
+                                      + np.count_nonzero(stripe > max_height))
+                    np.clip(stripe, min_height, max_height, out=stripe)
+                
+                # Normalize (0.0 to 1.0) and scale (0 to 65535)
+                # Unity expects: 0 = minimum height, 65535 = maximum height
+                normalize_to_uint16(stripe, min_height, max_height,
+                                    out=raw[row_offset:row_offset + stripe.shape[0]])
+            raw.flush()
+        finally:
+            # Release the mapping (the file can't be reopened on Windows while mapped)
+            del raw
+
+        if clipped_count:
+            feedback.pushConsoleInfo(
+                f"⚠ Warning: {clipped_count:,} pixels were outside the band's stored statistics "
+                f"({min_height:.2f}m to {max_height:.2f}m) and were clipped. The statistics are "
+                f"out of date: recompute them (e.g. gdalinfo -stats) and run the conversion again.")
 
         feedback.pushConsoleInfo(f"\n✓ SUCCESS! File saved to: {output_raw_path}")
         return True
@@ -439,20 +806,130 @@ def process_geotiff_for_unity(input_path, output_raw_path, feedback: QgsProcessi
     
     finally:
         # 5. CLEANUP
-        # Close datasets (if they are still open)
+        # Close the dataset (if it is still open)
         dataset = None
-        cropped_ds = None
-        
-        # Unlink the in-memory virtual files
-        try:
-            gdal.Unlink(temp_cropped_path)
-        except: pass
+        band = None
+        # Restore the GDAL settings changed above
+        if gdal_state is not None:
+            _restore_gdal_settings(gdal_state)
+
+
+#
+# --- Helper Function: Batch Processing ---
+#
+
+class _BufferedFeedback:
+    """
+    Collects a worker's console messages, so they can be replayed in order on
+    the calling thread instead of interleaving with other files' logs.
+    """
+    
+    def __init__(self):
+        self.messages = []
+    
+    def pushConsoleInfo(self, info):
+        self.messages.append(info)
+
+
+def process_batch(input_paths, output_dir, feedback: QgsProcessingFeedback, jobs=None,
+                  detect_padding=True):
+    """
+    Converts several GeoTIFFs to <name>.raw files in output_dir, a few at a time.
+    
+    Files run in worker threads: GDAL reads and the numpy passes release the
+    GIL, so conversions overlap without a process pool (which can't be used
+    from inside QGIS). Each file's log is written to feedback once it is done.
+    
+    Inputs whose output name is already taken (e.g. dem.tif and dem.tiff, both
+    dem.raw) are skipped with an error instead of writing the same file twice.
+    Canceling stops the files that haven't started yet; files that are already
+    being converted still run to completion (and are logged) before this returns.
+    Every input gets an entry in the result, so the ones that didn't run are None.
+    
+    Args:
+        input_paths: list of input GeoTIFF paths
+        output_dir: folder for the .raw files (must exist)
+        feedback: QgsProcessingFeedback for logging and progress
+        jobs: number of files converted at once (default: half the CPU cores)
+        detect_padding: passed on to process_geotiff_for_unity
+    
+    Returns:
+        dict: input path -> output .raw path, or None if that file failed
+    """
+    if jobs is None:
+        jobs = max(1, (os.cpu_count() or 2) // 2)
+    
+    def convert(input_path, output_path):
+        # Files queued before the cancel was noticed are dropped here
+        if feedback.isCanceled():
+            return False, []
+        buffered = _BufferedFeedback()
+        success = process_geotiff_for_unity(input_path, output_path, buffered, detect_padding,
+                                            _gdal_settings=False)
+        return success, buffered.messages
+    
+    # Inputs stay None unless their conversion runs and succeeds
+    results = dict.fromkeys(input_paths)
+    # The GDAL settings are process-wide, so they are set once for the whole
+    # batch (not saved and restored by each worker while others are reading)
+    gdal_state = _apply_gdal_settings()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = []
+            output_owners = {}
+            for input_path in input_paths:
+                name = os.path.splitext(os.path.basename(input_path))[0]
+                output_path = os.path.join(output_dir, name + '.raw')
+                # Compared the way the platform does (case-insensitive on Windows)
+                owner = output_owners.setdefault(os.path.normcase(output_path), input_path)
+                if owner != input_path:
+                    feedback.pushConsoleInfo(
+                        f"Error: Skipping {os.path.basename(input_path)}: {name}.raw "
+                        f"is already the output of {os.path.basename(owner)}")
+                    continue
+                futures.append((input_path, output_path, executor.submit(convert, input_path, output_path)))
+            
+            canceled = False
+            for done, (input_path, output_path, future) in enumerate(futures, start=1):
+                if not canceled and feedback.isCanceled():
+                    # Drop the files that haven't started yet; the running
+                    # ones are still waited for, so their output gets logged
+                    canceled = True
+                    for _, _, pending in futures:
+                        pending.cancel()
+                if future.cancelled():
+                    continue
+                success, messages = future.result()
+                for message in messages:
+                    feedback.pushConsoleInfo(message)
+                results[input_path] = output_path if success else None
+                feedback.setProgress(100 * done / len(futures))
+    finally:
+        _restore_gdal_settings(gdal_state)
+    
+    return results
 
 
 #
 # --- Main QGIS Algorithm Class ---
 #
 
+def _algorithm_icon(algorithm):
+    """
+    Returns the plugin icon for an algorithm of this plugin, or the default
+    Processing icon if icon.png is missing.
+    """
+    # Get the plugin directory (same directory as this file)
+    plugin_dir = os.path.dirname(__file__)
+    icon_path = os.path.join(plugin_dir, 'icon.png')
+    
+    # Return the icon if it exists, otherwise use default
+    if os.path.exists(icon_path):
+        return QIcon(icon_path)
+    else:
+        return QgsProcessingAlgorithm.icon(algorithm)
+
+
 class ConvertToUnityRaw(QgsProcessingAlgorithm):
     """
     This is the main algorithm class.
@@ -465,6 +942,7 @@ class ConvertToUnityRaw(QgsProcessingAlgorithm):
     # --- Parameter Definitions ---
     INPUT = 'INPUT'
     OUTPUT = 'OUTPUT'
+    DETECT_PADDING = 'DETECT_PADDING'
 
     def initAlgorithm(self, config=None):
         """
@@ -488,6 +966,15 @@ class ConvertToUnityRaw(QgsProcessingAlgorithm):
                 self.tr('Unity RAW Files (*.raw)') # File filter
             )
         )
+        
+        # 3. Zero-padding detection (can be turned off for large batch runs)
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.DETECT_PADDING,
+                self.tr('Detect and exclude zero-value border padding'),
+                defaultValue=True
+            )
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         """
@@ -502,9 +989,11 @@ class ConvertToUnityRaw(QgsProcessingAlgorithm):
             
         input_path = input_layer.source()
         output_path = self.parameterAsFileOutput(parameters, self.OUTPUT, context)
+        detect_padding = self.parameterAsBoolean(parameters, self.DETECT_PADDING, context)
 
         # 2. Call our main processing function
-        success = process_geotiff_for_unity(input_path, output_path, feedback)
+        success = process_geotiff_for_unity(input_path, output_path, feedback,
+                                            detect_padding=detect_padding)
 
         if success:
             # 3. Return the path to the output file on success
@@ -549,18 +1038,136 @@ class ConvertToUnityRaw(QgsProcessingAlgorithm):
         """
         Returns the icon for the algorithm.
         """
-        # Get the plugin directory (same directory as this file)
-        plugin_dir = os.path.dirname(__file__)
-        icon_path = os.path.join(plugin_dir, 'icon.png')
+        return _algorithm_icon(self)
+
+    def tr(self, string):
+        """
+        Returns a translated string for the algorithm.
+        """
+        return QCoreApplication.translate(self.__class__.__name__, string)
+
+
+class BatchConvertToUnityRaw(QgsProcessingAlgorithm):
+    """
+    Converts every GeoTIFF in a folder to a Unity .raw file (same processing
+    as ConvertToUnityRaw), several files at a time.
+    """
+    
+    # --- Parameter Definitions ---
+    INPUT = 'INPUT'
+    OUTPUT = 'OUTPUT'
+    DETECT_PADDING = 'DETECT_PADDING'
+    
+    # File extensions picked up from the input folder
+    EXTENSIONS = ('.tif', '.tiff')
+
+    def initAlgorithm(self, config=None):
+        """
+        Defines the algorithm's user interface (the parameters).
+        """
+        
+        # 1. Input folder with GeoTIFFs
+        self.addParameter(
+            QgsProcessingParameterFile(
+                self.INPUT,
+                self.tr('Input Folder (GeoTIFFs)'),
+                behavior=QgsProcessingParameterFile.Folder
+            )
+        )
+        
+        # 2. Output folder for the .raw files
+        self.addParameter(
+            QgsProcessingParameterFolderDestination(
+                self.OUTPUT,
+                self.tr('Output Folder')
+            )
+        )
         
-        # Return the icon if it exists, otherwise use default
-        if os.path.exists(icon_path):
-            return QIcon(icon_path)
+        # 3. Zero-padding detection (can be turned off for large batch runs)
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.DETECT_PADDING,
+                self.tr('Detect and exclude zero-value border padding'),
+                defaultValue=True
+            )
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """
+        This is called when the user clicks "Run".
+        """
+        
+        # 1. Collect the input files
+        input_dir = self.parameterAsFile(parameters, self.INPUT, context)
+        output_dir = self.parameterAsString(parameters, self.OUTPUT, context)
+        detect_padding = self.parameterAsBoolean(parameters, self.DETECT_PADDING, context)
+        
+        input_paths = sorted(
+            os.path.join(input_dir, name) for name in os.listdir(input_dir)
+            if name.lower().endswith(self.EXTENSIONS)
+        )
+        if not input_paths:
+            feedback.pushConsoleInfo(self.tr("No GeoTIFF files found in the input folder."))
+            return {self.OUTPUT: None}
+        
+        # 2. Convert them
+        os.makedirs(output_dir, exist_ok=True)
+        results = process_batch(input_paths, output_dir, feedback, detect_padding=detect_padding)
+        
+        failed = [path for path, output in results.items() if output is None]
+        converted = f"Converted {len(results) - len(failed)} of {len(input_paths)} files."
+        if feedback.isCanceled():
+            # Inputs that never started are None too, so they aren't "failed"
+            feedback.pushConsoleInfo(f"\nBatch canceled. {converted}")
+            for path in failed:
+                feedback.pushConsoleInfo(f"  Not converted: {os.path.basename(path)}")
         else:
-            return QgsProcessingAlgorithm.icon(self)
+            feedback.pushConsoleInfo(f"\n{converted}")
+            for path in failed:
+                feedback.pushConsoleInfo(f"  Failed: {os.path.basename(path)}")
+        
+        return {self.OUTPUT: output_dir}
+
+    # --- Boilerplate Metadata Methods ---
+    
+    def name(self):
+        """
+        Returns the unique algorithm ID (must not contain spaces).
+        """
+        return 'batch_convert_unity_raw'
+
+    def displayName(self):
+        """
+        Returns the human-readable name shown in the toolbox.
+        """
+        return self.tr('Batch Convert Folder to Unity RAW')
+
+    def group(self):
+        """
+        Returns the name of the group this algorithm belongs to.
+        """
+        return self.tr('Unity Tools')
+
+    def groupId(self):
+        """
+        Returns the unique ID of the group.
+        """
+        return 'unity_tools'
+
+    def createInstance(self):
+        """
+        Required method to create a new instance of the class.
+        """
+        return BatchConvertToUnityRaw()
+    
+    def icon(self):
+        """
+        Returns the icon for the algorithm.
+        """
+        return _algorithm_icon(self)
 
     def tr(self, string):
         """
         Returns a translated string for the algorithm.
         """
-        return QCoreApplication.translate(self.__class__.__name__, string)
\ No newline at end of file
+        return QCoreApplication.translate(self.__class__.__name__, string)
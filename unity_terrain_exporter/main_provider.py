@@ -2,46 +2,74 @@
 # It groups all our algorithms under one "provider" in the toolbox.
 
 import os
+import sys
+import importlib
 from qgis.core import QgsProcessingProvider
 from qgis.PyQt.QtGui import QIcon
 
-# Import our algorithm class from the other file
-from .convert_unity_raw import ConvertToUnityRaw
+# The algorithm modules (numpy, GDAL) are imported in loadAlgorithms, so
+# registering the provider at QGIS startup stays cheap
+
+# Unique, machine-readable provider ID
+PROVIDER_ID = 'unity_tools_provider'
+# Name of the provider's group in the toolbox
+PROVIDER_NAME = 'Unity Conversion Tools'
 
 class UnityToolsProvider(QgsProcessingProvider):
     """
     This is the provider class that manages and exposes
     our processing algorithms to QGIS.
     """
+    
+    # Icon shared by all instances, loaded on the first icon() call
+    _ICON = None
+    
+    # Algorithms as (module, class name); add new algorithms here
+    _FACTORIES = (
+        ('convert_unity_raw', 'ConvertToUnityRaw'),
+        ('convert_unity_raw', 'BatchConvertToUnityRaw'),
+    )
 
-    def loadAlgorithms(self, *args, **kwargs):
+    def loadAlgorithms(self):
         """ Loads all available algorithms. """
-        # Add our single algorithm to the provider
-        self.addAlgorithm(ConvertToUnityRaw())
-        # You could add more algorithms here in the future
+        for module_name, class_name in self._FACTORIES:
+            # Each module is only imported once (then found in sys.modules)
+            module = importlib.import_module('.' + module_name, __package__)
+            self.addAlgorithm(getattr(module, class_name)())
+
+    def unload(self):
+        """ Releases cached objects when the provider is removed. """
+        UnityToolsProvider._ICON = None
+        for module_name in {module_name for module_name, _ in self._FACTORIES}:
+            # Only modules that were actually imported hold caches
+            module = sys.modules.get(__package__ + '.' + module_name)
+            if module is not None and hasattr(module, 'clear_caches'):
+                module.clear_caches()
 
-    def id(self, *args, **kwargs):
+    def id(self):
         """ Returns the unique provider ID. """
-        # This ID should be unique and machine-readable
-        return 'unity_tools_provider'
+        return PROVIDER_ID
 
-    def name(self, *args, **kwargs):
+    def name(self):
         """ Returns the provider's display name. """
-        # This is the name for the group in the toolbox
-        return 'Unity Conversion Tools'
+        return PROVIDER_NAME
 
-    def icon(self, *args, **kwargs):
+    def icon(self):
         """ Returns the icon for the tool group. """
-        # Get the plugin directory
-        plugin_dir = os.path.dirname(__file__)
-        icon_path = os.path.join(plugin_dir, 'icon.png')
-        
-        # Return the icon if it exists, otherwise use default
-        if os.path.exists(icon_path):
-            return QIcon(icon_path)
-        else:
-            return QgsProcessingProvider.icon(self)
-
-    def longName(self, *args, **kwargs):
+        # QGIS asks for the icon from several places (toolbox, history,
+        # search), so the file lookup and QIcon are only done once
+        if UnityToolsProvider._ICON is None:
+            # Get the plugin directory
+            plugin_dir = os.path.dirname(__file__)
+            icon_path = os.path.join(plugin_dir, 'icon.png')
+            
+            # Use the icon if it exists, otherwise use default
+            if os.path.exists(icon_path):
+                UnityToolsProvider._ICON = QIcon(icon_path)
+            else:
+                UnityToolsProvider._ICON = QgsProcessingProvider.icon(self)
+        return UnityToolsProvider._ICON
+
+    def longName(self):
         """ Returns a longer description for the provider. """
-        return self.name()
\ No newline at end of file
+        return PROVIDER_NAME
\ No newline at end of file